@@ -4,23 +4,51 @@ __version__ = '3.0.1'
 
 try:
     from amzsear.core.AmzSear import AmzSear
+    from amzsear.core.AsyncAmzSear import AsyncAmzSear
+    from amzsear.core.AmzMultiSear import AmzMultiSear
     from amzsear.core.AmzProduct import AmzProduct
     from amzsear.core.AmzProductDetails import AmzProductDetails
     from amzsear.core.AmzReviews import AmzReviews, AmzReview
+    from amzsear.core.AmzQuestions import AmzQuestions, AmzQuestion
+    from amzsear.core.AmzCache import AmzCache
+    from amzsear.core.AmzMemo import AmzMemo
+    from amzsear.core.AmzRateLimiter import AmzRateLimiter
+    from amzsear.core.AmzParquetWriter import AmzParquetWriter
+    from amzsear.core.AmzChangeTracker import AmzChangeTracker
+    from amzsear.core.AmzStore import AmzStore
     from amzsear.core.selectors import DetailLevel
 except ImportError:
     from .core.AmzSear import AmzSear
+    from .core.AsyncAmzSear import AsyncAmzSear
+    from .core.AmzMultiSear import AmzMultiSear
     from .core.AmzProduct import AmzProduct
     from .core.AmzProductDetails import AmzProductDetails
     from .core.AmzReviews import AmzReviews, AmzReview
+    from .core.AmzQuestions import AmzQuestions, AmzQuestion
+    from .core.AmzCache import AmzCache
+    from .core.AmzMemo import AmzMemo
+    from .core.AmzRateLimiter import AmzRateLimiter
+    from .core.AmzParquetWriter import AmzParquetWriter
+    from .core.AmzChangeTracker import AmzChangeTracker
+    from .core.AmzStore import AmzStore
     from .core.selectors import DetailLevel
 
 __all__ = [
     '__version__',
     'AmzSear',
+    'AsyncAmzSear',
+    'AmzMultiSear',
     'AmzProduct',
     'AmzProductDetails',
     'AmzReviews',
     'AmzReview',
+    'AmzQuestions',
+    'AmzQuestion',
+    'AmzCache',
+    'AmzMemo',
+    'AmzRateLimiter',
+    'AmzParquetWriter',
+    'AmzChangeTracker',
+    'AmzStore',
     'DetailLevel',
 ]
@@ -1,16 +1,20 @@
 import argparse
-import json
+import contextlib
+import os
 import sys
 import webbrowser
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
 
 try:
     from amzsear import AmzSear, AmzProduct, DetailLevel, __version__
-    from amzsear.core.consts import DEFAULT_REGION, REGION_CODES, PRODUCT_URL
-    from amzsear.core import build_base_url, FetchError
+    from amzsear.core.consts import DEFAULT_REGION, REGION_CODES, PRODUCT_URL, POOL_SIZE
+    from amzsear.core import build_url, build_base_url, new_session, dumps, FetchError
 except ImportError:
     from .. import AmzSear, AmzProduct, DetailLevel, __version__
-    from ..core.consts import DEFAULT_REGION, REGION_CODES, PRODUCT_URL
-    from ..core import build_base_url, FetchError
+    from ..core.consts import DEFAULT_REGION, REGION_CODES, PRODUCT_URL, POOL_SIZE
+    from ..core import build_url, build_base_url, new_session, dumps, FetchError
+
+BATCH_ONLY_ARGS = ['queries_file', 'workers']
 
 
 def run(*passed_args):
@@ -20,6 +24,14 @@ def run(*passed_args):
     args = vars(args)
 
     try:
+        # Handle batch mode
+        if args.get('queries_file'):
+            if args.get('query') or args.get('asin') or args.get('select') is not None or args.get('browser'):
+                parser.error('--queries-file cannot be combined with a query, --asin, --select or --browser')
+            if not run_batch(args):
+                sys.exit(1)
+            return
+
         # Handle product lookup mode
         if args.get('asin'):
             run_product(args)
@@ -29,8 +41,17 @@ def run(*passed_args):
         if not args.get('query'):
             parser.error('query is required (or use --asin ASIN)')
 
+        # Stream products as each page is parsed, unless one must be selected from them
+        if args['ndjson'] and args['select'] is None:
+            stream_ndjson(AmzSear.iter_products(query=args['query'], page=args['page'], region=args['region']),
+                verbose=args['verbose'])
+            if args['browser']:
+                webbrowser.open(build_url(query=args['query'], page_num=args['page'], region=args['region']))
+            return
+
         # Handle search mode
-        amz_args = {x: y for x, y in args.items() if x not in ['select', 'verbose', 'json', 'browser', 'asin']}
+        amz_args = {x: y for x, y in args.items()
+            if x not in ['select', 'verbose', 'json', 'ndjson', 'browser', 'asin'] + BATCH_ONLY_ARGS}
         out = AmzSear(**amz_args)
 
         if args['select'] is not None:
@@ -48,6 +69,8 @@ def run(*passed_args):
         # handle output
         if args['json']:
             print_json(out, verbose=args['verbose'])
+        elif args['ndjson']:
+            stream_ndjson(out.values(), verbose=args['verbose'])
         elif args['verbose']:
             print_verbose(out)
         else:
@@ -66,6 +89,11 @@ def run(*passed_args):
     except IndexError as e:
         print(f"Error: Index out of range - {e}", file=sys.stderr)
         sys.exit(1)
+    except BrokenPipeError:
+        # The output was closed early (e.g. piped to head), so stop quietly
+        #  without Python's error on flushing stdout at exit
+        os.dup2(os.open(os.devnull, os.O_WRONLY), sys.stdout.fileno())
+        sys.exit(1)
 
 
 def run_product(args):
@@ -86,6 +114,8 @@ def run_product(args):
     # Handle output
     if args['json']:
         print_product_json(product, verbose=args['verbose'])
+    elif args['ndjson']:
+        print_product_json(product, verbose=args['verbose'], pretty=False)
     elif args['verbose']:
         print_product_verbose(product)
     else:
@@ -96,6 +126,129 @@ def run_product(args):
 
 
 
+def run_batch(args):
+    """
+    Handle batch mode, searching every query of a queries file on a worker pool.
+
+    Results are printed as each query completes (not necessarily in file
+    order), and a failed query is reported on stderr without stopping the
+    others.
+
+    Returns:
+        bool: True if every query succeeded.
+    """
+    workers = max(1, args['workers'])
+
+    ok = True
+    pending = {}  # future -> (query, pages)
+
+    def print_done(done):
+        nonlocal ok
+        for future in done:
+            query, pages = pending.pop(future)
+            try:
+                print_batch_result(future.result(), query, pages, args)
+            except FetchError as e:
+                print(f"Error: {query!r}: {e}", file=sys.stderr)
+                ok = False
+            sys.stdout.flush()
+
+    if args['queries_file'] == '-':
+        queries_file = contextlib.nullcontext(sys.stdin)
+    else:
+        try:
+            queries_file = open(args['queries_file'], encoding='utf-8')
+        except OSError as e:
+            print(f"Error: {e}", file=sys.stderr)
+            return False
+
+    # All workers share one session (queries are all in one region), with a
+    #  pool sized to fit them; the global sessions are left as they are
+    session = new_session(pool_size=max(POOL_SIZE, workers))
+    with session, queries_file as lines, ThreadPoolExecutor(max_workers=workers) as executor:
+        for line_num, line in enumerate(lines, 1):
+            try:
+                entry = parse_query_line(line, default_page=args['page'])
+            except ValueError as e:
+                print(f"Error: line {line_num}: {e}", file=sys.stderr)
+                ok = False
+                continue
+            if entry is None:
+                continue
+
+            # Bound the queries in flight, so a long (or endless) input is
+            #  read as the workers get through it
+            if len(pending) >= 2 * workers:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                print_done(done)
+
+            query, pages = entry
+            future = executor.submit(AmzSear, query=query, page=pages, region=args['region'], session=session)
+            pending[future] = entry
+
+        while pending:
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            print_done(done)
+
+    return ok
+
+
+def parse_query_line(line, default_page=1):
+    """
+    Parse a line of a queries file.
+
+    Lines are a query, optionally followed by a tab and the pages to search
+    as numbers and ranges (e.g. "harry potter\t1-3,5"). Blank lines and
+    lines starting with # are skipped.
+
+    Returns:
+        tuple or None: (query, list of pages), or None for a skipped line.
+
+    Raises:
+        ValueError: If the pages are not valid.
+    """
+    line = line.rstrip('\r\n')
+    if not line.strip() or line.lstrip().startswith('#'):
+        return None
+
+    query, _, page_text = line.partition('\t')
+    query = query.strip()
+    if not query:
+        raise ValueError('missing query')
+    if not page_text.strip():
+        return (query, [default_page])
+
+    pages = []
+    for part in page_text.split(','):
+        start, _, end = part.strip().partition('-')
+        try:
+            start, end = int(start), int(end or start)
+        except ValueError:
+            raise ValueError(f'invalid pages {page_text.strip()!r}') from None
+        if start < 1 or end < start:
+            raise ValueError(f'invalid pages {page_text.strip()!r}')
+        pages.extend(range(start, end + 1))
+    return (query, pages)
+
+
+def print_batch_result(out, query, pages, args):
+    """Print the results of one batch query in the selected output format."""
+    if args['ndjson']:
+        stream_ndjson(out.values(), verbose=args['verbose'], extra={'query': query})
+        return
+    if args['json']:
+        # One compact object per line, so the output can be read query by query
+        print(dumps({'query': query, 'page': pages, 'results': get_json_data(out, verbose=args['verbose'])}))
+        return
+
+    print(f"# {query} (page {', '.join(map(str, pages))})")
+    if args['verbose']:
+        print_verbose(out)
+    else:
+        print_short(out)
+        print()
+
+
 def get_parser():
     """Create and return the argument parser."""
     parser = argparse.ArgumentParser(description='The unofficial Amazon search CLI')
@@ -116,8 +269,16 @@ def get_parser():
 
     parser.add_argument('-v', '--verbose', action='store_true',
         help='Show full product details instead of summary')
-    parser.add_argument('-j', '--json', action='store_true',
+    output_format = parser.add_mutually_exclusive_group()
+    output_format.add_argument('-j', '--json', action='store_true',
         help='Output in JSON format')
+    output_format.add_argument('-n', '--ndjson', action='store_true',
+        help='Output one JSON object per product and line, as soon as it is parsed')
+
+    parser.add_argument('-f', '--queries-file', type=str, default=None, metavar='FILE',
+        help='Search every query in FILE (one per line, "-" for stdin) instead of a single query')
+    parser.add_argument('-w', '--workers', type=int, default=4,
+        help='The number of queries searched at once with --queries-file (defaults to 4)')
 
     parser.add_argument('-V', '--version', action='version',
         version=f'amzsear {__version__}',
@@ -128,19 +289,41 @@ def get_parser():
 
 def print_json(cls, verbose=False):
     """Print JSON output. Verbose includes all fields, short includes summary only."""
+    print(dumps(get_json_data(cls, verbose=verbose), pretty=True))
+
+
+def get_json_data(cls, verbose=False):
+    """Get the data printed by print_json, as a dict keyed by ASIN."""
     if verbose:
-        print(json.dumps({k: v.to_dict() for k,v in cls.items()}, indent=2))
-    else:
-        # Short JSON - just essential fields
-        data = {}
-        for asin, product in cls.items():
-            data[asin] = {
-                'title': product.get('title'),
-                'prices': product.get('prices'),
-                'rating': product.rating.to_dict() if product.rating else None,
-                'product_url': product.product_url
-            }
-        print(json.dumps(data, indent=2))
+        return {k: v.to_dict() for k,v in cls.items()}
+
+    # Short JSON - just essential fields
+    return {asin: get_short_json_data(product) for asin, product in cls.items()}
+
+
+def get_short_json_data(product):
+    """Get the essential fields of a product printed by print_json."""
+    return {
+        'title': product.get('title'),
+        'prices': product.get('prices'),
+        'rating': product.rating.to_dict() if product.rating else None,
+        'product_url': product.product_url
+    }
+
+
+def stream_ndjson(products, verbose=False, extra=None):
+    """
+    Print one compact JSON object per product, flushing after each.
+
+    Each object has the product's ASIN and the fields print_json would
+    print for it, after any extra fields.
+    """
+    for product in products:
+        data = dict(extra or {})
+        data['asin'] = product._index
+        data.update(product.to_dict() if verbose else get_short_json_data(product))
+        sys.stdout.write(dumps(data) + '\n')
+        sys.stdout.flush()
 
 def print_verbose(cls):
     """Print full verbose output without truncation."""
@@ -203,8 +386,8 @@ def print_short(cls):
 
 
 # Product output formatters
-def print_product_json(product, verbose=False):
-    """Output product details as JSON."""
+def print_product_json(product, verbose=False, pretty=True):
+    """Output product details as JSON (on one line unless pretty)."""
     data = {'asin': product.get_asin(), 'product_url': product.product_url}
 
     if product._fetch_error:
@@ -220,7 +403,7 @@ def print_product_json(product, verbose=False):
             data['rating'] = details.average_rating
             data['review_count'] = details.review_count
 
-    print(json.dumps(data, indent=2))
+    print(dumps(data, pretty=pretty))
 
 
 def print_product_verbose(product):
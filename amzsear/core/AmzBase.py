@@ -14,25 +14,50 @@ class AmzBase(object):
     to be defined in the object. The keys can also be indexed (as they would
     be for a dict) but can also be accessed as attributes.
 
+    Subclasses declare their keys once in the class-level _all_attrs list
+    (a schema shared by all instances) and store them in __slots__, so no
+    per-instance dict or key list is needed. Keys not in the schema are
+    stored in the _extra_attrs dict, only allocated for instances given
+    such keys.
+
     Optional Args:
         Any key value pairs passed to the constructor will be set as
         attributes that can be accessed using an index call or directly
         as an attribute.
     """
+    __slots__ = ('_is_valid', '_extra_attrs')
+
     _all_attrs = []  # Subclasses should define their own _all_attrs
+    _lazy_attrs = ()  # Keys left unset on creation, to be computed by __getattr__
 
     REPR_MAX_LEN = REPR_MAX_LEN_DEFAULT
 
     def __init__(self, **kws):
         # Initialize instance-level attributes
         self._is_valid = False
-        # Create instance copy of _all_attrs if subclass defines it as class attr
-        if '_all_attrs' not in self.__dict__:
-            self._all_attrs = list(self.__class__._all_attrs)
+        self._extra_attrs = None
+        for attr_name in self._all_attrs:
+            if attr_name not in self._lazy_attrs:
+                setattr(self, attr_name, None)
         for k, v in kws.items():
             setattr(self, k, v)
-            if k not in self._all_attrs:
-                self._all_attrs.append(k)
+
+    def __getattr__(self, name):
+        # Only reached for attributes that are not set slots, e.g. extra keys
+        if name != '_extra_attrs':
+            extras = self._extra_attrs
+            if extras is not None and name in extras:
+                return extras[name]
+        raise AttributeError(f'{self.__class__.__name__!r} object has no attribute {name!r}')
+
+    def __setattr__(self, name, value):
+        try:
+            object.__setattr__(self, name, value)
+        except AttributeError:
+            # Not a slot, so an extra key outside the schema
+            if self._extra_attrs is None:
+                self._extra_attrs = {}
+            self._extra_attrs[name] = value
 
     def __getitem__(self, key):
         return self.get(key, raise_error=True)
@@ -44,19 +69,40 @@ class AmzBase(object):
         return self.is_valid()
 
     def __contains__(self,it):
-        return it in list(self)
+        return it in self._attr_names() and getattr(self, it, None) is not None
 
     def __iter__(self):
-        for attr_name in self._all_attrs:
+        for attr_name in self._attr_names():
             if getattr(self, attr_name, None) is not None:
                 yield attr_name
 
+    def __getstate__(self):
+        state = {}
+        for cls in type(self).__mro__:
+            for name in cls.__dict__.get('__slots__', ()):
+                try:
+                    # Read the slot directly so unset lazy keys stay unset
+                    state[name] = cls.__dict__[name].__get__(self, cls)
+                except AttributeError:
+                    pass
+        return state
+
+    def __setstate__(self, state):
+        for k, v in state.items():
+            setattr(self, k, v)
+
+    def _attr_names(self):
+        """The schema keys followed by any extra keys of this instance."""
+        if self._extra_attrs is None:
+            return self._all_attrs
+        return self._all_attrs + list(self._extra_attrs)
+
     def __repr__(self):
         def get_repr():
             out = []
 
             if len(self) > 0:
-                max_k = len(max(self._all_attrs, key=lambda x: len(x)))
+                max_k = len(max(self._attr_names(), key=lambda x: len(x)))
                 str_format = '{:%d}    {}' % (max_k)
                 for key, value in self.items():
                     #indent newlines (these will usually be for an instance of a class inheriting AmzBase)
@@ -86,13 +132,14 @@ class AmzBase(object):
         Returns:
             The value of the key or the default value if an error is not raised.
         """
-        if key not in self:
+        value = getattr(self, key, None) if key in self._attr_names() else None
+        if value is None:
             if raise_error:
                 raise KeyError(f'The key {repr(key)} is not a known attribute')
             else:
                 return default
 
-        return getattr(self, key)
+        return value
 
     @requires_valid_data(default=iter(()))
     def items(self):
@@ -102,9 +149,10 @@ class AmzBase(object):
         Returns:
             generator: A generator yielding (name, value) tuples.
         """
-        for attr_name in self._all_attrs:
-            if getattr(self, attr_name, None) is not None:
-                yield (attr_name, getattr(self, attr_name))
+        for attr_name in self._attr_names():
+            value = getattr(self, attr_name, None)
+            if value is not None:
+                yield (attr_name, value)
 
     @requires_valid_data(default=[])
     def keys(self):
@@ -154,11 +202,14 @@ class AmzBase(object):
         Returns:
             dict: A dict with attribute names as keys and their values as values.
         """
-        d = {}
+        return self._to_dict_into({}, recursive=recursive, flatten=flatten)
+
+    def _to_dict_into(self, d, recursive=True, flatten=False):
+        """Add the items of to_dict to an existing dict d, returning d."""
         for k, v in self.items():
             if recursive and hasattr(v, 'to_dict'):
                 if flatten:
-                    d = {**d, **v.to_dict()}
+                    d.update(v.to_dict())
                 else:
                     d[k] = v.to_dict()
             else:
@@ -0,0 +1,234 @@
+"""
+AmzCache class for persisting fetched Amazon pages between runs.
+"""
+import sqlite3
+import threading
+import time
+from urllib import parse
+
+try:
+    from amzsear.core.consts import CACHE_TTL, CACHE_MAX_SIZE, ROBOT_CHECK_MARKERS, SEARCH_RESULT_MARKER
+except ImportError:
+    from .consts import CACHE_TTL, CACHE_MAX_SIZE, ROBOT_CHECK_MARKERS, SEARCH_RESULT_MARKER
+
+
+class AmzCache(object):
+    """
+    A persistent cache of fetched pages, stored in SQLite.
+
+    Pages are keyed by their normalized URL and expire after a time to live
+    that depends on the page type (search, product, reviews, qa or other).
+    Once the stored pages exceed max_size bytes, the least recently used
+    pages are evicted. Pages that should not be served again (robot checks,
+    empty pages and search pages without results) are never stored, so one
+    blocked fetch does not stand in for the page until it expires. The cache
+    is safe to share between threads.
+
+    The cache is opt-in and is enabled for all fetches with set_cache:
+
+        >>> from amzsear.core import set_cache
+        >>> set_cache(AmzCache('amzsear_cache.db'))
+
+    Args:
+        path (str): The SQLite database file (':memory:' for a cache that only
+            lasts as long as the object).
+        ttl (dict): Time to live in seconds per page type, merged over the
+            defaults in CACHE_TTL.
+        max_size (int): The maximum total size of stored pages in bytes.
+
+    Attributes:
+        hits (int): The number of lookups answered from the cache.
+        misses (int): The number of lookups not in the cache (or expired).
+        skipped (int): The number of pages not stored as they were not
+            cacheable (see is_cacheable).
+    """
+
+    def __init__(self, path='amzsear_cache.db', ttl=None, max_size=CACHE_MAX_SIZE):
+        self.ttl = {**CACHE_TTL, **(ttl or {})}
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self.skipped = 0
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute(
+            'CREATE TABLE IF NOT EXISTS pages ('
+            'url TEXT PRIMARY KEY, page_type TEXT NOT NULL, content BLOB NOT NULL, '
+            'size INTEGER NOT NULL, fetched_at REAL NOT NULL, accessed_at REAL NOT NULL)')
+        self._conn.execute('CREATE INDEX IF NOT EXISTS pages_accessed_at ON pages (accessed_at)')
+        self._conn.commit()
+        self._size = self._total_size()
+
+    def __len__(self):
+        with self._lock:
+            return self._conn.execute('SELECT COUNT(*) FROM pages').fetchone()[0]
+
+    @staticmethod
+    def normalize_url(url):
+        """
+        Normalize a URL so equivalent page requests share a cache key.
+
+        The host is lower-cased, the fragment dropped and the query parameters
+        sorted.
+
+        Args:
+            url (str): The URL to normalize.
+
+        Returns:
+            str: The normalized URL.
+        """
+        parsed_obj = parse.urlparse(url)
+        query = parse.urlencode(sorted(parse.parse_qsl(parsed_obj.query, keep_blank_values=True)))
+        return parsed_obj._replace(netloc=parsed_obj.netloc.lower(), query=query, fragment='').geturl()
+
+    @classmethod
+    def is_cacheable(cls, url, content):
+        """
+        Check if a fetched page can be stored.
+
+        Args:
+            url (str): The URL of the page.
+            content (bytes): The page content.
+
+        Returns:
+            bool: False for empty pages, robot checks (captcha forms) and
+                search pages without any search results, True otherwise.
+        """
+        if not content or any(marker in content for marker in ROBOT_CHECK_MARKERS):
+            return False
+        if cls.page_type(url) == 'search' and SEARCH_RESULT_MARKER not in content:
+            return False
+        return True
+
+    @staticmethod
+    def page_type(url):
+        """
+        Get the page type of a URL, used to pick its time to live.
+
+        Args:
+            url (str): An Amazon URL.
+
+        Returns:
+            str: One of 'search', 'product', 'reviews', 'qa' or 'other'.
+        """
+        path = parse.urlparse(url).path
+        if path.startswith('/s/') or path == '/s':
+            return 'search'
+        elif '/dp/' in path:
+            return 'product'
+        elif path.startswith('/product-reviews/'):
+            return 'reviews'
+        elif path.startswith('/ask/'):
+            return 'qa'
+        return 'other'
+
+    def get(self, url):
+        """
+        Get a cached page.
+
+        Args:
+            url (str): The URL of the page.
+
+        Returns:
+            bytes or None: The page content, or None if it is not cached or
+                has expired.
+        """
+        key = self.normalize_url(url)
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                'SELECT page_type, content, size, fetched_at FROM pages WHERE url = ?', (key,)).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+
+            page_type, content, size, fetched_at = row
+            if now - fetched_at > self.ttl.get(page_type, self.ttl['other']):
+                self._conn.execute('DELETE FROM pages WHERE url = ?', (key,))
+                self._conn.commit()
+                self._size -= size
+                self.misses += 1
+                return None
+
+            self._conn.execute('UPDATE pages SET accessed_at = ? WHERE url = ?', (now, key))
+            self._conn.commit()
+            self.hits += 1
+            return bytes(content)
+
+    def set(self, url, content):
+        """
+        Store a page, evicting the least recently used pages if over max_size.
+
+        Pages that are not cacheable (see is_cacheable) are not stored.
+
+        Args:
+            url (str): The URL of the page.
+            content (bytes): The page content.
+        """
+        key = self.normalize_url(url)
+        size = len(content)
+        if size > self.max_size:
+            return
+        if not self.is_cacheable(key, content):
+            with self._lock:
+                self.skipped += 1
+            return
+
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                'INSERT OR REPLACE INTO pages (url, page_type, content, size, fetched_at, accessed_at) '
+                'VALUES (?, ?, ?, ?, ?, ?)', (key, self.page_type(key), content, size, now, now))
+
+            # The file may be shared with other processes, so the total is read
+            #  back (within this transaction) rather than tracked locally
+            self._size = self._total_size()
+            while self._size > self.max_size:
+                oldest = self._conn.execute(
+                    'SELECT url, size FROM pages ORDER BY accessed_at LIMIT 64').fetchall()
+                if not oldest:
+                    break
+                for old_key, old_size in oldest:
+                    self._conn.execute('DELETE FROM pages WHERE url = ?', (old_key,))
+                    self._size -= old_size
+                    if self._size <= self.max_size:
+                        break
+                self._size = self._total_size()
+            self._conn.commit()
+
+    def _total_size(self):
+        """The total size of the stored pages, read from the database."""
+        return self._conn.execute('SELECT COALESCE(SUM(size), 0) FROM pages').fetchone()[0]
+
+    def clear(self):
+        """Remove all cached pages and reset the statistics."""
+        with self._lock:
+            self._conn.execute('DELETE FROM pages')
+            self._conn.commit()
+            self._size = 0
+            self.hits = 0
+            self.misses = 0
+            self.skipped = 0
+
+    def close(self):
+        """Close the underlying database connection."""
+        with self._lock:
+            self._conn.close()
+
+    def stats(self):
+        """
+        Get cache statistics.
+
+        Returns:
+            dict: hits, misses, hit_rate, skipped, entries and size (in bytes).
+        """
+        lookups = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / lookups if lookups else 0.0,
+            'skipped': self.skipped,
+            'entries': len(self),
+            'size': self._size,
+        }
@@ -0,0 +1,278 @@
+"""
+AmzChangeTracker class for incremental re-crawls, reporting only what changed.
+"""
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+try:
+    from amzsear.core import build_base_url, fetch_content_conditional, parse_content, product_values, FetchError
+    from amzsear.core.consts import PRODUCT_URL
+    from amzsear.core.AmzProductDetails import AmzProductDetails
+except ImportError:
+    from . import build_base_url, fetch_content_conditional, parse_content, product_values, FetchError
+    from .consts import PRODUCT_URL
+    from .AmzProductDetails import AmzProductDetails
+
+
+class AmzChangeTracker(object):
+    """
+    A persistent record of the products seen on earlier crawls, stored in
+    SQLite, used to re-crawl incrementally.
+
+    Each product (by region and ASIN) keeps a fingerprint of its search
+    result and of its product page details. Fingerprints are hashes of the
+    extracted fields rather than of the raw HTML, as Amazon's pages contain
+    tokens (e.g. the qid in result links) that change on every request.
+
+    update compares search results against the last crawl and returns the
+    changes in the tracked values (price, rating, rating_count, plus
+    review_count and average_rating from product pages). fetch_details
+    then only fetches the product page of products whose search result
+    changed, sending the page's ETag/Last-Modified so Amazon can answer
+    304 Not Modified:
+
+        >>> tracker = AmzChangeTracker('amzsear_tracker.db')
+        >>> amz = AmzSear('Harry Potter', page=range(1, 6))
+        >>> changes = tracker.update(amz)
+        >>> changes += tracker.fetch_details(amz)
+
+    Changes are dicts of region, asin, field, old and new values. A product
+    seen for the first time has a change for each of its values, with old
+    values of None.
+
+    Args:
+        path (str): The SQLite database file (':memory:' for a tracker that
+            only lasts as long as the object).
+
+    Attributes:
+        fetched (int): The number of product pages fetched by fetch_details.
+        not_modified (int): The number of product pages answered with 304
+            Not Modified.
+        skipped (int): The number of products fetch_details skipped as their
+            search result had not changed.
+    """
+    _result_fields = ('title', 'image_url', 'rating', 'prices', 'extra_attributes', 'subtext')
+
+    def __init__(self, path='amzsear_tracker.db'):
+        self.fetched = 0
+        self.not_modified = 0
+        self.skipped = 0
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute(
+            'CREATE TABLE IF NOT EXISTS products ('
+            'region TEXT NOT NULL, asin TEXT NOT NULL, result_hash BLOB, details_hash BLOB, '
+            'details_result_hash BLOB, etag TEXT, last_modified TEXT, state TEXT NOT NULL, '
+            'seen_at REAL NOT NULL, PRIMARY KEY (region, asin))')
+        self._conn.commit()
+
+    def __len__(self):
+        with self._lock:
+            return self._conn.execute('SELECT COUNT(*) FROM products').fetchone()[0]
+
+    @staticmethod
+    def fingerprint(obj, fields):
+        """
+        Get the fingerprint of some fields of an AmzBase object.
+
+        Args:
+            obj (AmzBase): The object (e.g. an AmzProduct).
+            fields (iterable): The attribute names to include.
+
+        Returns:
+            bytes: A 16 byte BLAKE2b digest of the field values.
+        """
+        values = {}
+        for k in fields:
+            v = getattr(obj, k, None)
+            values[k] = v.to_dict() if hasattr(v, 'to_dict') else v
+        data = json.dumps(values, sort_keys=True, default=str).encode('utf-8')
+        return hashlib.blake2b(data, digest_size=16).digest()
+
+    @staticmethod
+    def _details_values(details):
+        """The tracked values of product page details."""
+        return {'review_count': details.review_count, 'average_rating': details.average_rating}
+
+    @staticmethod
+    def _changes(region, asin, old, new):
+        """The changes between two dicts of tracked values."""
+        return [{'region': region, 'asin': asin, 'field': k, 'old': old.get(k), 'new': v}
+            for k, v in new.items() if old.get(k) != v]
+
+    def _get(self, region, asin):
+        """Get the stored row of a product as a dict, or None."""
+        cursor = self._conn.execute('SELECT * FROM products WHERE region = ? AND asin = ?', (region, asin))
+        row = cursor.fetchone()
+        if row is None:
+            return None
+        row = dict(zip([c[0] for c in cursor.description], row))
+        row['state'] = json.loads(row['state'])
+        return row
+
+    def update(self, products):
+        """
+        Record the search results of a crawl, returning what changed.
+
+        Args:
+            products (AmzSear or iterable): The products found.
+
+        Returns:
+            list: A change dict per changed value (see AmzChangeTracker).
+        """
+        if hasattr(products, 'values'):
+            products = products.values()
+
+        changes = []
+        now = time.time()
+        with self._lock:
+            for product in products:
+                if product._index:
+                    changes += self._update(product, now)
+            self._conn.commit()
+        return changes
+
+    def _update(self, product, now):
+        """Record one search result (with the lock held), returning what changed."""
+        region, asin = product._region.upper(), product._index
+        result_hash = self.fingerprint(product, self._result_fields)
+        stored = self._get(region, asin)
+
+        if stored is not None and stored['result_hash'] == result_hash:
+            self._conn.execute('UPDATE products SET seen_at = ? WHERE region = ? AND asin = ?',
+                (now, region, asin))
+            return []
+
+        old_state = stored['state'] if stored is not None else {}
+        values = product_values(product)
+        state = json.dumps({**old_state, **values})
+        if stored is None:
+            self._conn.execute(
+                'INSERT INTO products (region, asin, result_hash, state, seen_at) VALUES (?, ?, ?, ?, ?)',
+                (region, asin, result_hash, state, now))
+        else:
+            self._conn.execute(
+                'UPDATE products SET result_hash = ?, state = ?, seen_at = ? WHERE region = ? AND asin = ?',
+                (result_hash, state, now, region, asin))
+        return self._changes(region, asin, old_state, values)
+
+    def needs_details(self, product):
+        """
+        Check if a product's page should be fetched.
+
+        Args:
+            product (AmzProduct): A product passed to update.
+
+        Returns:
+            bool: True if the product's details were never fetched, or its
+                search result changed since they were.
+        """
+        with self._lock:
+            stored = self._get(product._region.upper(), product._index)
+        if stored is None or stored['details_hash'] is None:
+            return True
+        return stored['details_result_hash'] != self.fingerprint(product, self._result_fields)
+
+    def fetch_details(self, products, max_workers=8, session=None, force=False):
+        """
+        Fetch the product pages of changed products, returning what changed.
+
+        Only products that need it (see needs_details) are fetched, with
+        conditional request headers. The details attribute of each product
+        whose page was fetched and parsed is set, as with
+        AmzProduct.fetch_details at DetailLevel.BASIC. A failed fetch is
+        stored in the product's _fetch_error and tried again next time.
+
+        Args:
+            products (AmzSear or iterable): Products passed to update.
+            max_workers (int): The number of pages fetched at once.
+            session (requests.Session): A session to fetch pages with (defaults
+                to the shared per-host connection pool).
+            force (bool): If True, fetch the pages of all products (still
+                conditionally).
+
+        Returns:
+            list: A change dict per changed value (see AmzChangeTracker).
+        """
+        if hasattr(products, 'values'):
+            products = products.values()
+
+        todo = []
+        for product in products:
+            if not product._index:
+                continue
+            if force or self.needs_details(product):
+                todo.append(product)
+            else:
+                self.skipped += 1
+
+        def fetch(product):
+            with self._lock:
+                stored = self._get(product._region.upper(), product._index) or {}
+            url = PRODUCT_URL % (build_base_url(product._region), product._index)
+            try:
+                return fetch_content_conditional(url, etag=stored.get('etag'),
+                    last_modified=stored.get('last_modified'), session=session)
+            except FetchError as e:
+                return e
+
+        results = []
+        if todo:
+            with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(todo)))) as executor:
+                results = list(executor.map(fetch, todo))
+
+        changes = []
+        now = time.time()
+        with self._lock:
+            for product, result in zip(todo, results):
+                if isinstance(result, FetchError):
+                    product._fetch_error = str(result)
+                    continue
+                region, asin = product._region.upper(), product._index
+                content, etag, last_modified = result
+                result_hash = self.fingerprint(product, self._result_fields)
+                stored = self._get(region, asin)
+                if stored is None:
+                    # Not passed to update, so record the search result too
+                    changes += self._update(product, now)
+                    stored = self._get(region, asin)
+
+                if content is None:
+                    self.not_modified += 1
+                    details_hash = stored['details_hash']
+                    state = stored['state']
+                else:
+                    self.fetched += 1
+                    product.details = parse_content(content, AmzProductDetails)
+                    details_hash = self.fingerprint(product.details, AmzProductDetails._all_attrs)
+                    state = stored['state']
+                    if details_hash != stored['details_hash']:
+                        values = self._details_values(product.details)
+                        changes += self._changes(region, asin, state, values)
+                        state = {**state, **values}
+
+                self._conn.execute(
+                    'UPDATE products SET details_hash = ?, details_result_hash = ?, etag = ?, '
+                    'last_modified = ?, state = ?, seen_at = ? WHERE region = ? AND asin = ?',
+                    (details_hash, result_hash, etag, last_modified, json.dumps(state), now, region, asin))
+            self._conn.commit()
+        return changes
+
+    def clear(self):
+        """Remove all tracked products and reset the statistics."""
+        with self._lock:
+            self._conn.execute('DELETE FROM products')
+            self._conn.commit()
+            self.fetched = 0
+            self.not_modified = 0
+            self.skipped = 0
+
+    def close(self):
+        """Close the underlying database connection."""
+        with self._lock:
+            self._conn.close()
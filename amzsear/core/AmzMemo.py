@@ -0,0 +1,171 @@
+"""
+AmzMemo class for reusing parse results of identical pages.
+"""
+import copy
+import hashlib
+import os
+import pickle
+import threading
+from collections import OrderedDict
+
+from lxml import html as html_module
+
+try:
+    from amzsear.core.AmzBase import AmzBase
+except ImportError:
+    from .AmzBase import AmzBase
+
+
+class AmzMemo(object):
+    """
+    A bounded memo of parsed pages, keyed by a hash of the raw page content.
+
+    When a page is parsed again with identical content (retries, duplicate
+    URLs, cached pages), the earlier result is returned instead of building
+    the lxml tree and running the selectors again. Results are returned as
+    copies, so changing them (e.g. setting attributes with fetch_details or
+    editing their prices) does not change the memoized objects. Results
+    that still hold lxml elements (e.g. lazy products, see AmzProduct) are
+    not memoized, as lxml trees must not be shared between threads.
+
+    Warning: a memo file is a pickle, and loading a pickle can run arbitrary
+    code. Only load memo files that you wrote yourself and that no one else
+    can write to.
+
+    The memo is opt-in and is enabled for all parsing with set_memo:
+
+        >>> from amzsear.core import set_memo
+        >>> set_memo(AmzMemo(max_entries=10000))
+
+    Args:
+        max_entries (int): The number of parsed pages to keep in memory, the
+            least recently used being dropped first.
+        path (str): An optional file the memo is loaded from on creation and
+            written to by save(). The file is unpickled, so it must be
+            trusted (see the warning above).
+
+    Attributes:
+        hits (int): The number of pages answered from the memo.
+        misses (int): The number of pages that had to be parsed.
+    """
+
+    def __init__(self, max_entries=1024, path=None):
+        self.max_entries = max_entries
+        self.path = path
+        self.hits = 0
+        self.misses = 0
+
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()
+        if path is not None and os.path.exists(path):
+            with open(path, 'rb') as f:
+                self._entries.update(pickle.load(f))
+
+    def __len__(self):
+        return len(self._entries)
+
+    @staticmethod
+    def content_hash(content):
+        """
+        Get the hash identifying some page content.
+
+        Args:
+            content (bytes or str): The raw HTML of a page.
+
+        Returns:
+            bytes: A 16 byte BLAKE2b digest.
+        """
+        if isinstance(content, str):
+            content = content.encode('utf-8')
+        return hashlib.blake2b(content, digest_size=16).digest()
+
+    def parse(self, content, parser, *args, raw=False):
+        """
+        Parse page content, or return the memoized result for identical content.
+
+        Args:
+            content (bytes or str): The raw HTML of a page.
+            parser (callable): Called as parser(html_element, *args).
+            args: Extra arguments for parser, also part of the key.
+            raw (bool): If True, parser is called with the content itself
+                rather than a tree.
+
+        Returns:
+            A copy of the parser result.
+        """
+        key = (parser.__module__, parser.__qualname__, args, self.content_hash(content))
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return self._copy(self._entries[key])
+
+        result = parser(content if raw else html_module.fromstring(content), *args)
+
+        with self._lock:
+            self.misses += 1
+            if self._holds_tree(result):
+                return result
+            self._entries[key] = result
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return self._copy(result)
+
+    @staticmethod
+    def _holds_tree(result):
+        """Check if a parse result holds lxml elements (lazy products)."""
+        items = result if isinstance(result, list) else [result]
+        return any(getattr(x, '_root', None) is not None for x in items)
+
+    @staticmethod
+    def _copy(result):
+        """
+        Copy a memoized parse result.
+
+        AmzBase objects are rebuilt from the slots already set, without going
+        through __getstate__, and containers are copied recursively.
+        """
+        if isinstance(result, AmzBase):
+            obj = object.__new__(type(result))
+            for cls in type(result).__mro__:
+                for name in cls.__dict__.get('__slots__', ()):
+                    try:
+                        value = cls.__dict__[name].__get__(result, cls)
+                    except AttributeError:
+                        continue
+                    setattr(obj, name, AmzMemo._copy(value))
+            return obj
+        if type(result) in (list, tuple, set):
+            return type(result)(AmzMemo._copy(x) for x in result)
+        if isinstance(result, dict):
+            copied = copy.copy(result)
+            for k, v in result.items():
+                copied[k] = AmzMemo._copy(v)
+            return copied
+        return copy.deepcopy(result)
+
+    def clear(self):
+        """Remove all memoized results and reset the statistics."""
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def save(self, path=None):
+        """
+        Write the memoized results to a file, as a pickle.
+
+        Keep the file private: anyone who can change it can run code in the
+        next process that loads it.
+
+        Args:
+            path (str): The file to write (defaults to the path given to the
+                constructor).
+        """
+        path = path or self.path
+        if path is None:
+            raise ValueError('No path given to save the memo to')
+        with self._lock:
+            entries = OrderedDict(self._entries)
+        with open(path, 'wb') as f:
+            pickle.dump(entries, f, protocol=pickle.HIGHEST_PROTOCOL)
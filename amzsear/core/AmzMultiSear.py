@@ -0,0 +1,183 @@
+from concurrent.futures import ThreadPoolExecutor
+
+try:
+    from amzsear.core import build_url, get_iter, fetch_content, parse_content, FetchError
+    from amzsear.core.consts import REGION_CODES
+    from amzsear.core.AmzSear import AmzSear
+except ImportError:
+    from . import build_url, get_iter, fetch_content, parse_content, FetchError
+    from .consts import REGION_CODES
+    from .AmzSear import AmzSear
+
+
+class AmzMultiSear(AmzSear):
+    """
+    The AmzMultiSear class extends AmzSear with the results of one query
+    searched in several Amazon regions.
+
+    Products are indexed by (region, ASIN) tuples rather than by ASIN, so
+    the same product found in several regions is kept once per region:
+
+        >>> amz = AmzSear.multi_region('Harry Potter', regions=['US', 'UK', 'DE'])
+        >>> amz[('UK', '0747532699')]
+        >>> amz.get_regions('0747532699')   # {'US': AmzProduct, 'UK': AmzProduct}
+
+    Searches should be created with the search classmethod (or
+    AmzSear.multi_region). A region whose pages fail to fetch does not stop
+    the other regions; its error is kept in errors instead.
+
+    Attributes:
+        regions (list): The regions searched, in the order given.
+        errors (dict): Region mapped to the error message of its first failed
+            page, for regions with a failed page.
+    """
+    _repr_index_len = 22  # ('US', 'ASIN') + padding
+
+    def __init__(self, *args, **kwargs):
+        self.regions = []
+        self.errors = {}
+        super().__init__(*args, **kwargs)
+
+    @classmethod
+    def search(cls, query, regions=None, page=1, max_workers=16, session=None, fields=None, lazy=False):
+        """
+        Search several regions concurrently.
+
+        All pages of all regions are fetched at once (up to max_workers at a
+        time) over each region's own connection pool, then parsed in region
+        and page order.
+
+        Args:
+            query (str): A search query to look up on Amazon.
+            regions (iterable): The Amazon regions/countries to search
+                (defaults to all regions in REGION_CODES).
+            page (int or iterable): The page number(s) of the query searched
+                in every region (defaults to 1).
+            max_workers (int): The maximum number of pages fetched at once.
+            session (requests.Session): A session to fetch pages with (defaults
+                to the shared per-host connection pools).
+            fields (iterable): See AmzSear.
+            lazy (bool): See AmzSear.
+
+        Returns:
+            AmzMultiSear: The products of all regions, indexed by (region, ASIN).
+
+        Raises:
+            ValueError: If a region is not a known Amazon region.
+        """
+        regions = [r.upper() for r in get_iter(regions if regions is not None else REGION_CODES)]
+        pages = list(get_iter(page))
+        if fields is not None:
+            fields = tuple(fields)
+
+        # build_url raises ValueError for unknown regions before anything is fetched
+        jobs = [(region, build_url(query=query, page_num=p, region=region)) for region in regions for p in pages]
+
+        def fetch(url):
+            try:
+                return fetch_content(url, session=session)
+            except FetchError as e:
+                return e
+
+        contents = []
+        if jobs:
+            with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(jobs)))) as executor:
+                contents = list(executor.map(fetch, [url for _, url in jobs]))
+
+        amz = cls()
+        amz.regions = regions
+        for (region, url), content in zip(jobs, contents):
+            amz._urls.append(url)
+            if isinstance(content, FetchError):
+                amz.errors.setdefault(region, str(content))
+                continue
+            amz._add_products(parse_content(content, cls._parse_page_products, region, fields, lazy, raw=True))
+        return amz
+
+    @classmethod
+    def merge(cls, searches):
+        """
+        Merge several AmzMultiSear (or AmzSear) objects into a new one.
+
+        As AmzSear.merge, also combining the regions (those of AmzSear
+        objects being the regions of their products) and errors. a |= b
+        merges them in place in the same way.
+
+        Args:
+            searches (iterable): AmzSear objects to merge.
+
+        Returns:
+            AmzMultiSear: A new object with the products of all searches.
+        """
+        searches = list(searches)
+        merged = super().merge(searches)
+        merged._merge_regions(searches)
+        return merged
+
+    def __ior__(self, other):
+        if not isinstance(other, AmzSear):
+            return NotImplemented
+        super().__ior__(other)
+        self._merge_regions([other])
+        return self
+
+    def _merge_regions(self, searches):
+        """
+        Add the regions and errors of merged searches.
+
+        Regions come from the searches' regions (for AmzMultiSear objects)
+        and from the products indexed, so the regions of AmzSear objects are
+        included too.
+        """
+        for amz in searches:
+            for region in getattr(amz, 'regions', []):
+                if region not in self.regions:
+                    self.regions.append(region)
+            for region, error in getattr(amz, 'errors', {}).items():
+                self.errors.setdefault(region, error)
+        for region, _ in self._index_map:
+            if region not in self.regions:
+                self.regions.append(region)
+
+    def get_regions(self, asin):
+        """
+        Get a product in every region it was found in.
+
+        Args:
+            asin (str): The ASIN of the product.
+
+        Returns:
+            dict: Region mapped to the AmzProduct, in region order.
+        """
+        asin = str(asin)
+        return {r: self._index_map[(r, asin)] for r in self.regions if (r, asin) in self._index_map}
+
+    def to_dataframe(self, recursive=True, flatten=False):
+        """
+        Convert to a Pandas DataFrame indexed by a (region, asin) MultiIndex.
+
+        See AmzSear.to_dataframe for the arguments.
+        """
+        # Only import at this point as amzSear can be used without pandas if desired
+        from pandas import MultiIndex
+        df = super().to_dataframe(recursive=recursive, flatten=flatten)
+        df.index = MultiIndex.from_tuples(self._indexes, names=['region', 'asin'])
+        return df
+
+    def _index_fields(self, key):
+        """The fields identifying a product in to_records."""
+        return {'region': key[0], 'asin': key[1]}
+
+    def _product_key(self, prod):
+        """The index of a product, which is its (region, ASIN) tuple."""
+        return (prod._region.upper(), prod._index)
+
+    def _normalize_key(self, key):
+        """Convert a (region, ASIN) key to the form of the indexes."""
+        try:
+            region, asin = key
+        except (TypeError, ValueError):
+            return None
+        if not isinstance(region, str):
+            return None
+        return (region.upper(), str(asin))
@@ -0,0 +1,198 @@
+"""
+AmzParquetWriter class for streaming products to a Parquet file.
+"""
+try:
+    from amzsear.core.AmzProduct import AmzProduct
+except ImportError:
+    from .AmzProduct import AmzProduct
+
+
+class AmzParquetWriter(object):
+    """
+    Writes products to a Parquet file in Arrow record batches as they arrive.
+
+    Products are buffered and written batch_size at a time, so a crawl of
+    any size can be written while only one batch is held in memory:
+
+        >>> with AmzParquetWriter('crawl.parquet') as writer:
+        ...     for product in AmzSear.iter_products('Harry Potter', page=range(1, 21)):
+        ...         writer.write(product)
+
+    Every file has the same schema (see schema), whatever fields are set:
+    a product's region and asin, its search result fields, the rating as a
+    struct, prices as a map and details, reviews and questions as structs
+    (null until fetched).
+
+    pyarrow must be installed for this class to be used.
+
+    Args:
+        path (str): The Parquet file to write.
+        batch_size (int): The number of products per record batch (and row
+            group).
+        compression (str): The Parquet compression codec.
+
+    Attributes:
+        rows (int): The number of products written (including buffered ones).
+    """
+
+    def __init__(self, path, batch_size=1000, compression='zstd'):
+        # Only import at this point as amzSear can be used without pyarrow if desired
+        import pyarrow.parquet as pq
+
+        self.path = path
+        self.batch_size = batch_size
+        self.rows = 0
+        self._buffer = []
+        self._schema = self.schema()
+        self._writer = pq.ParquetWriter(path, self._schema, compression=compression)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    @staticmethod
+    def schema():
+        """
+        Get the Arrow schema of the written files.
+
+        Returns:
+            pyarrow.Schema: The schema, one field per product attribute.
+        """
+        import pyarrow as pa
+
+        string_map = pa.map_(pa.string(), pa.string())
+        review = pa.struct([
+            ('review_id', pa.string()),
+            ('reviewer', pa.string()),
+            ('rating', pa.float64()),
+            ('title', pa.string()),
+            ('date', pa.string()),
+            ('text', pa.string()),
+            ('verified', pa.bool_()),
+            ('helpful_count', pa.int64()),
+            ('images', pa.list_(pa.string())),
+        ])
+        question = pa.struct([
+            ('question', pa.string()),
+            ('answers', pa.list_(pa.string())),
+        ])
+        return pa.schema([
+            ('region', pa.string()),
+            ('asin', pa.string()),
+            ('title', pa.string()),
+            ('product_url', pa.string()),
+            ('image_url', pa.string()),
+            ('rating', pa.struct([
+                ('ratings_text', pa.string()),
+                ('ratings_count_text', pa.string()),
+            ])),
+            ('prices', string_map),
+            ('extra_attributes', string_map),
+            ('subtext', pa.list_(pa.string())),
+            ('details', pa.struct([
+                ('full_title', pa.string()),
+                ('brand', pa.string()),
+                ('brand_url', pa.string()),
+                ('about_items', pa.list_(pa.string())),
+                ('technical_details', string_map),
+                ('product_description', pa.string()),
+                ('image_urls', pa.list_(pa.string())),
+                ('reviews_summary', pa.string()),
+                ('star_distribution', pa.map_(pa.int64(), pa.int64())),
+                ('review_count', pa.int64()),
+                ('average_rating', pa.float64()),
+            ])),
+            ('reviews', pa.struct([
+                ('total_count', pa.int64()),
+                ('feature_ratings', string_map),
+                ('reviews', pa.list_(review)),
+            ])),
+            ('questions', pa.struct([
+                ('questions', pa.list_(question)),
+            ])),
+        ])
+
+    def write(self, products):
+        """
+        Add products, writing a record batch each time batch_size are buffered.
+
+        Args:
+            products (AmzProduct, AmzSear or iterable): The product(s) to write.
+        """
+        if isinstance(products, AmzProduct):
+            products = [products]
+        elif hasattr(products, 'values'):
+            products = products.values()
+
+        for product in products:
+            self._buffer.append(self._to_row(product))
+            self.rows += 1
+            if len(self._buffer) >= self.batch_size:
+                self.flush()
+
+    def flush(self):
+        """Write any buffered products as a record batch."""
+        if not self._buffer:
+            return
+        import pyarrow as pa
+        batch = pa.RecordBatch.from_pylist(self._buffer, schema=self._schema)
+        self._buffer = []
+        self._writer.write_batch(batch)
+
+    def close(self):
+        """Write any buffered products and finish the file."""
+        if self._writer is not None:
+            self.flush()
+            self._writer.close()
+            self._writer = None
+
+    @classmethod
+    def _to_row(cls, product):
+        """Convert a product to a dict matching the schema."""
+        return {
+            'region': product._region,
+            'asin': product._index,
+            'title': product.title,
+            'product_url': product.product_url,
+            'image_url': product.image_url,
+            'rating': cls._to_struct(product.rating),
+            'prices': cls._to_map(product.prices),
+            'extra_attributes': cls._to_map(product.extra_attributes),
+            'subtext': product.subtext,
+            'details': cls._to_struct(product.details, maps=('technical_details', 'star_distribution')),
+            'reviews': cls._to_reviews(product.reviews),
+            'questions': cls._to_questions(product.questions),
+        }
+
+    @staticmethod
+    def _to_map(d):
+        """Convert a dict to the list of pairs Arrow takes for a map."""
+        return list(d.items()) if d is not None else None
+
+    @classmethod
+    def _to_struct(cls, obj, maps=()):
+        """Convert an AmzBase object to a dict for a struct (None if not set)."""
+        if obj is None:
+            return None
+        row = {k: obj.get(k) for k in obj._all_attrs}
+        for k in maps:
+            row[k] = cls._to_map(row[k])
+        return row
+
+    @classmethod
+    def _to_reviews(cls, reviews):
+        """Convert an AmzReviews object to a dict for the reviews struct (None if not set)."""
+        if reviews is None:
+            return None
+        row = cls._to_struct(reviews, maps=('feature_ratings',))
+        row['reviews'] = [cls._to_struct(r) for r in reviews.reviews or []]
+        return row
+
+    @classmethod
+    def _to_questions(cls, questions):
+        """Convert an AmzQuestions object to a dict for the questions struct (None if not set)."""
+        if questions is None:
+            return None
+        return {'questions': [cls._to_struct(q) for q in questions.questions or []]}
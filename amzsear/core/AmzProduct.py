@@ -1,20 +1,28 @@
+import asyncio
 import re
+from concurrent.futures import ThreadPoolExecutor
 
 try:
     from amzsear.core.AmzBase import AmzBase
-    from amzsear.core import requires_valid_data, capture_exception, build_url, build_base_url, fetch_html, FetchError
+    from amzsear.core import requires_valid_data, capture_exception, build_url, build_base_url, fetch_content, fetch_content_async, parse_content, new_async_session, FetchError
     from amzsear.core.AmzRating import AmzRating
     from amzsear.core.AmzProductDetails import AmzProductDetails
     from amzsear.core.AmzReviews import AmzReviews
-    from amzsear.core.selectors import DetailLevel
+    from amzsear.core.AmzQuestions import AmzQuestions
+    from amzsear.core.selectors import (DetailLevel, RESULT_LINK_XPATH, RESULT_TITLE_XPATH,
+        RESULT_SUBTEXT_ROW_XPATH, RESULT_SUBTEXT_XPATH, RESULT_IMAGE_XPATH,
+        RESULT_PRICE_NAME_XPATH, RESULT_PRICE_TEXT_XPATH, RESULT_EXTRAS_XPATH)
     from amzsear.core.consts import PRODUCT_URL, REVIEWS_URL, QA_URL, DEFAULT_REGION
 except ImportError:
     from .AmzBase import AmzBase
-    from . import requires_valid_data, capture_exception, build_url, build_base_url, fetch_html, FetchError
+    from . import requires_valid_data, capture_exception, build_url, build_base_url, fetch_content, fetch_content_async, parse_content, new_async_session, FetchError
     from .AmzRating import AmzRating
     from .AmzProductDetails import AmzProductDetails
     from .AmzReviews import AmzReviews
-    from .selectors import DetailLevel
+    from .AmzQuestions import AmzQuestions
+    from .selectors import (DetailLevel, RESULT_LINK_XPATH, RESULT_TITLE_XPATH,
+        RESULT_SUBTEXT_ROW_XPATH, RESULT_SUBTEXT_XPATH, RESULT_IMAGE_XPATH,
+        RESULT_PRICE_NAME_XPATH, RESULT_PRICE_TEXT_XPATH, RESULT_EXTRAS_XPATH)
     from .consts import PRODUCT_URL, REVIEWS_URL, QA_URL, DEFAULT_REGION
 
 
@@ -35,35 +43,63 @@ class AmzProduct(AmzBase):
             name and/or the date of publication.
         details (AmzProductDetails): Detailed product info (populated by fetch_details).
         reviews (AmzReviews): Product reviews (populated by fetch_details).
+        questions (AmzQuestions): Customer questions and answers (populated by
+            fetch_details at DetailLevel.FULL).
 
     This class should usually not be instantiated directly (rather be used in
     an AmzSear object) but can be created by passing an HTML element to
     the constructor. If nothing is passed, an empty AmzProduct object is created.
+    A product is valid if its title, product_url and image can be extracted,
+    whether its fields are extracted eagerly, lazily or only in part.
 
     Args:
         html_element (lxml.html.HtmlElement): A root for an HTML tree derived from
             an element on an Amazon search page.
         region (str): Amazon region code (default: 'US').
+        fields (iterable): Only extract these search result fields (the title
+            and product_url are always extracted); the others are left as None.
+        lazy (bool): If True, only the title and product_url are extracted up
+            front. Every other field is extracted from the element the first
+            time it is accessed, so the element (and its page, unless only the
+            search results were parsed, see iter_subtrees) is kept alive
+            until all of them have been read.
     """
-    title = None
-    product_url = None
-    image_url = None
-    rating = None
-    prices = None
-    extra_attributes = None
-    subtext = None
-    details = None  # AmzProductDetails object (populated by fetch_details)
-    reviews = None  # AmzReviews object (populated by fetch_details)
-    _fetch_error = None  # Error message if fetch_details failed
+    __slots__ = ('title', 'product_url', 'image_url', 'rating', 'prices',
+        'extra_attributes', 'subtext',
+        'details',  # AmzProductDetails object (populated by fetch_details)
+        'reviews',  # AmzReviews object (populated by fetch_details)
+        'questions',  # AmzQuestions object (populated by fetch_details)
+        '_fetch_error',  # Error message if fetch_details failed
+        '_region', '_index', '_root', '_title_root')
 
     _all_attrs = ['title','product_url','image_url','rating','prices',
-        'extra_attributes', 'subtext', 'details', 'reviews']
-
-    def __init__(self, html_element=None, region=DEFAULT_REGION):
+        'extra_attributes', 'subtext', 'details', 'reviews', 'questions']
+
+    # Fields extracted from a search result other than title and product_url.
+    # These are left unset on creation so that, if not extracted up front,
+    # __getattr__ extracts them on first access.
+    _result_fields = ('subtext', 'image_url', 'rating', 'prices', 'extra_attributes')
+    _lazy_attrs = _result_fields
+    # Fields whose elements a valid search result must have, whether or not
+    # they are extracted up front
+    _required_fields = ('image_url',)
+
+    def __init__(self, html_element=None, region=DEFAULT_REGION, fields=None, lazy=False):
         super().__init__()
         self._region = region
+        self._index = None
+        self._fetch_error = None
+        self._root = None
+        self._title_root = None
         if html_element is not None:
-            html_dict = self._get_from_html(html_element)
+            if lazy:
+                html_dict = self._get_from_html(html_element, fields=())
+                if len(html_dict) > 0:
+                    self._root = html_element
+                    self._title_root = html_dict.pop('_title_root')
+            else:
+                html_dict = self._get_from_html(html_element, fields=fields)
+                html_dict.pop('_title_root', None)
             for k, v in html_dict.items():
                 setattr(self, k, v)
             if len(html_dict) > 0:
@@ -71,50 +107,124 @@ class AmzProduct(AmzBase):
                 # Set _index to ASIN for use as key in AmzSear collection
                 self._index = self.get_asin()
 
+    def __getattr__(self, name):
+        # Only reached for attributes not set on the instance or class
+        if name not in AmzProduct._result_fields:
+            return super().__getattr__(name)
+
+        value = None
+        root = self._root
+        if root is not None:
+            try:
+                value = self._extract_field(name, root, self._title_root)
+            except IndexError:
+                pass
+        setattr(self, name, value)
+
+        if root is not None and all(self._is_set(f) for f in AmzProduct._result_fields):
+            # Every field has been extracted, let go of the page
+            self._root = None
+            self._title_root = None
+        return value
+
+    def __getstate__(self):
+        # Extract any pending lazy fields so no lxml element is copied/pickled
+        if self._root is not None:
+            for name in AmzProduct._result_fields:
+                getattr(self, name)
+        state = super().__getstate__()
+        state['_root'] = None
+        state['_title_root'] = None
+        return state
+
+    def _is_set(self, name):
+        """Check if a slot has a value, without extracting it if lazy."""
+        try:
+            AmzProduct.__dict__[name].__get__(self, AmzProduct)
+            return True
+        except AttributeError:
+            return False
+
+    def _is_extracted(self, name):
+        """Check if a field was (or can still be) extracted from the search result."""
+        return self._is_set(name) or self._root is not None
+
     @capture_exception(IndexError, default={})
-    def _get_from_html(self, root):
+    def _get_from_html(self, root, fields=None):
         """
         Parse product data from HTML element.
 
+        Args:
+            root: The lxml element of a search result.
+            fields (iterable): The fields to extract besides title and
+                product_url, or None for all of them.
+
         Returns:
-            dict: A dict of fields with extracted data.
+            dict: A dict of fields with extracted data (plus the '_title_root'
+                element they were extracted from).
         """
         d = {}
 
-        title_root = [x for x in root.cssselect('a') if len(x.cssselect('h2')) > 0][0]
-        d['title'] = ''.join([x.text_content() for x in title_root.cssselect('h2')])
-        d['product_url'] = build_url(title_root.get('href'), region=self._region)
-        for elem in title_root.getparent().getparent().cssselect('div[class="a-row a-spacing-none"]'):
-            temp_subtext = ''.join([x.text_content() for x in elem.cssselect('span[class*="a-size-small"]')])
-            if len(temp_subtext) > 0:
-                d['subtext'] = d.get('subtext',[]) + [temp_subtext]
-
-
-        d['image_url'] = root.cssselect('img[src]')[0].get('src')
-        d['rating'] = AmzRating(root) or None
-
-        d['prices'] = {}
-        price_names = root.cssselect('h3[data-attribute]')
-        price_text = root.cssselect('span[class^="a"]')
-        price_text = filter(lambda x: re.match(r'^[^a-z\-]+$', str(x.text)) and
-            re.search(r'[.,]', str(x.text)) and re.search(r'\d', str(x.text)), price_text)
+        title_root = [x for x in RESULT_LINK_XPATH(root) if len(RESULT_TITLE_XPATH(x)) > 0][0]
+        d['_title_root'] = title_root
+        d['title'] = ''.join([x.text_content() for x in RESULT_TITLE_XPATH(title_root)]).strip()
+        d['product_url'] = build_url(title_root.get('href'), region=self._region).strip()
 
-        for i, el in enumerate(price_text):
-            if i >= len(price_names):
-                price_key = str(len(d['prices']))  # defaults to a number if no name for price type
-            else:
-                price_key = price_names[i].text
-            d['prices'][price_key] = el.text
-
-        extras = root.cssselect('div[class="a-fixed-left-grid-inner"] > div > span')
-        extras = [re.sub(r'\s+', ' ', x.text_content().strip()) for x in extras]
-        d['extra_attributes'] = dict(list(zip(extras,extras[1:]))[::2])
+        for name in self._result_fields:
+            if fields is None or name in fields:
+                d[name] = self._extract_field(name, root, title_root)
+            elif name in self._required_fields:
+                # Not extracted now, but a result missing it is invalid
+                self._extract_field(name, root, title_root)
 
         # _index is the ASIN, used as key in AmzSear collection
         d['_index'] = None  # Will be set from product_url after extraction
 
-        # clean up before returning
-        return dict(map(lambda k: (k, d[k].strip() if isinstance(d[k],str) else d[k]), d)) 
+        return d
+
+    def _extract_field(self, name, root, title_root):
+        """
+        Extract a single field from a search result element.
+
+        Raises:
+            IndexError: If an element required by the field is missing.
+        """
+        if name == 'subtext':
+            subtext = []
+            for elem in RESULT_SUBTEXT_ROW_XPATH(title_root.getparent().getparent()):
+                temp_subtext = ''.join([x.text_content() for x in RESULT_SUBTEXT_XPATH(elem)])
+                if len(temp_subtext) > 0:
+                    subtext.append(temp_subtext)
+            return subtext or None
+
+        elif name == 'image_url':
+            src = RESULT_IMAGE_XPATH(root)[0].get('src')
+            return src.strip() if src is not None else None
+
+        elif name == 'rating':
+            return AmzRating(root) or None
+
+        elif name == 'prices':
+            prices = {}
+            price_names = RESULT_PRICE_NAME_XPATH(root)
+            price_text = RESULT_PRICE_TEXT_XPATH(root)
+            price_text = filter(lambda x: re.match(r'^[^a-z\-]+$', str(x.text)) and
+                re.search(r'[.,]', str(x.text)) and re.search(r'\d', str(x.text)), price_text)
+
+            for i, el in enumerate(price_text):
+                if i >= len(price_names):
+                    price_key = str(len(prices))  # defaults to a number if no name for price type
+                else:
+                    price_key = price_names[i].text
+                prices[price_key] = el.text
+            return prices
+
+        elif name == 'extra_attributes':
+            extras = RESULT_EXTRAS_XPATH(root)
+            extras = [re.sub(r'\s+', ' ', x.text_content().strip()) for x in extras]
+            return dict(list(zip(extras,extras[1:]))[::2])
+
+        raise ValueError(f'{name!r} is not a search result field')
 
 
     @requires_valid_data(default=[])
@@ -164,12 +274,14 @@ class AmzProduct(AmzBase):
             result = result.group(1)
         return result
 
-    def fetch_details(self, level=None, region=None):
+    def fetch_details(self, level=None, region=None, session=None):
         """
         Fetch detailed product information from Amazon.
 
         This method makes HTTP requests to Amazon to retrieve additional
-        product information beyond what's available in search results.
+        product information beyond what's available in search results. All
+        pages needed for the level are fetched concurrently. If any fetch
+        fails, the first error is stored and the other pages are still set.
 
         Args:
             level: DetailLevel enum specifying how much detail to fetch:
@@ -178,6 +290,8 @@ class AmzProduct(AmzBase):
                 - DetailLevel.REVIEWS (2): Also fetch reviews page
                 - DetailLevel.FULL (3): Also fetch Q&A page
             region: Amazon region code (e.g., 'US', 'UK', 'DE'). Defaults to US.
+            session: A requests.Session to fetch with (defaults to the shared
+                per-host connection pool).
 
         Returns:
             self: Returns self for method chaining
@@ -193,36 +307,137 @@ class AmzProduct(AmzBase):
         if region is not None:
             self._region = region
 
+        plan = self._get_fetch_plan(level)
+
+        def fetch(url):
+            try:
+                return fetch_content(url, session=session)
+            except FetchError as e:
+                return e
+
+        urls = [url for _, url, _ in plan]
+        if len(urls) > 1:
+            with ThreadPoolExecutor(max_workers=len(urls)) as executor:
+                contents = list(executor.map(fetch, urls))
+        else:
+            contents = [fetch(url) for url in urls]
+
+        self._set_fetched(plan, contents)
+        return self
+
+    def fetch_reviews(self, max_pages=10, concurrency=4, region=None, session=None):
+        """
+        Fetch several pages of reviews concurrently into the reviews attribute.
+
+        DetailLevel.REVIEWS only fetches the first page of reviews (about ten
+        reviews), this fetches up to max_pages pages (see
+        AmzReviews.fetch_reviews).
+
+        Args:
+            max_pages: The maximum number of review pages to fetch.
+            concurrency: The number of pages fetched at once.
+            region: Amazon region code (e.g., 'US', 'UK', 'DE'). Defaults to US.
+            session: A requests.Session to fetch with (defaults to the shared
+                per-host connection pool).
+
+        Returns:
+            self: Returns self for method chaining
+        """
+        if region is not None:
+            self._region = region
+
         asin = self.get_asin()
         if not asin:
             return self
 
-        base_url = build_base_url(self._region)
+        self._fetch_error = None
+        try:
+            self.reviews = AmzReviews.fetch_reviews(asin, max_pages=max_pages, concurrency=concurrency,
+                region=self._region, session=session)
+        except FetchError as e:
+            self._fetch_error = str(e)
+        return self
 
-        # Level 1: Fetch product page details
-        if level.value >= DetailLevel.BASIC.value:
-            product_url = PRODUCT_URL % (base_url, asin)
+    async def fetch_details_async(self, level=None, region=None, session=None):
+        """
+        Fetch detailed product information from Amazon without blocking.
+
+        The asynchronous counterpart of fetch_details, taking the same
+        arguments. aiohttp must be installed for this method to be called.
+
+        Args:
+            level: DetailLevel enum specifying how much detail to fetch.
+            region: Amazon region code (e.g., 'US', 'UK', 'DE'). Defaults to US.
+            session: An aiohttp.ClientSession to fetch with (a temporary
+                session is used if not given).
+
+        Returns:
+            self: Returns self for method chaining
+
+        Example:
+            >>> await product.fetch_details_async(level=DetailLevel.REVIEWS)
+        """
+        if level is None:
+            level = DetailLevel.BASIC
+
+        if region is not None:
+            self._region = region
+
+        plan = self._get_fetch_plan(level)
+        if not plan:
+            return self
+
+        if session is None:
+            async with new_async_session() as temp_session:
+                return await self.fetch_details_async(level, session=temp_session)
+
+        async def fetch(url):
             try:
-                html_elem = fetch_html(product_url)
-                self.details = AmzProductDetails(html_elem)
+                return await fetch_content_async(url, session=session)
             except FetchError as e:
-                self._fetch_error = str(e)
-                return self
+                return e
+
+        contents = await asyncio.gather(*[fetch(url) for _, url, _ in plan])
+        self._set_fetched(plan, contents)
+        return self
+
+    def _set_fetched(self, plan, contents):
+        """Parse fetched pages into their attributes, storing this run's first fetch error."""
+        self._fetch_error = None
+        for (attr, url, parser), content in zip(plan, contents):
+            if isinstance(content, FetchError):
+                if self._fetch_error is None:
+                    self._fetch_error = str(content)
+            else:
+                setattr(self, attr, parse_content(content, parser))
 
-        # Level 2: Fetch reviews page
+    def _get_fetch_plan(self, level):
+        """
+        Get the pages to fetch for a detail level.
+
+        Returns:
+            list: (attribute name, url, parser class) tuples, empty if the
+                product has no ASIN.
+        """
+        asin = self.get_asin()
+        if not asin:
+            return []
+
+        base_url = build_base_url(self._region)
+        plan = []
+
+        # Level 1: Product page details
+        if level.value >= DetailLevel.BASIC.value:
+            plan.append(('details', PRODUCT_URL % (base_url, asin), AmzProductDetails))
+
+        # Level 2: Reviews page
         if level.value >= DetailLevel.REVIEWS.value:
-            reviews_url = REVIEWS_URL % (base_url, asin)
-            try:
-                html_elem = fetch_html(reviews_url)
-                self.reviews = AmzReviews(html_elem)
-            except FetchError as e:
-                self._fetch_error = str(e)
+            plan.append(('reviews', REVIEWS_URL % (base_url, asin), AmzReviews))
 
-        # Level 3: Q&A would be fetched here (not implemented yet)
-        # if level.value >= DetailLevel.FULL.value:
-        #     qa_url = QA_URL % (base_url, asin)
-        #     ...
+        # Level 3: Q&A page
+        if level.value >= DetailLevel.FULL.value:
+            plan.append(('questions', QA_URL % (base_url, asin), AmzQuestions))
 
-        return self
+        return plan
 
 
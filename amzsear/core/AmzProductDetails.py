@@ -2,11 +2,30 @@
 AmzProductDetails class for storing detailed product information
 fetched from Amazon product pages.
 """
+import re
 
 try:
     from amzsear.core.AmzBase import AmzBase
+    from amzsear.core.selectors import (
+        PRODUCT_TITLE_XPATH, BRAND_LINK_XPATH, FEATURE_BULLETS_XPATH,
+        PRODUCT_DESCRIPTION_XPATH, PRODUCT_DESCRIPTION_ALT_XPATH,
+        TECH_DETAILS_ROWS_XPATH, TABLE_CELLS_XPATH,
+        PRODUCT_DETAILS_TABLE_XPATH, PRODUCT_DETAILS_TABLE_ALT_XPATH,
+        IMAGE_GALLERY_XPATH, MAIN_IMAGE_XPATH, IMAGE_THUMB_LIST_XPATH,
+        REVIEW_COUNT_XPATH, RATING_STARS_XPATH, STAR_HISTOGRAM_XPATH,
+        CUSTOMER_REVIEWS_SUMMARY_XPATH
+    )
 except ImportError:
     from .AmzBase import AmzBase
+    from .selectors import (
+        PRODUCT_TITLE_XPATH, BRAND_LINK_XPATH, FEATURE_BULLETS_XPATH,
+        PRODUCT_DESCRIPTION_XPATH, PRODUCT_DESCRIPTION_ALT_XPATH,
+        TECH_DETAILS_ROWS_XPATH, TABLE_CELLS_XPATH,
+        PRODUCT_DETAILS_TABLE_XPATH, PRODUCT_DETAILS_TABLE_ALT_XPATH,
+        IMAGE_GALLERY_XPATH, MAIN_IMAGE_XPATH, IMAGE_THUMB_LIST_XPATH,
+        REVIEW_COUNT_XPATH, RATING_STARS_XPATH, STAR_HISTOGRAM_XPATH,
+        CUSTOMER_REVIEWS_SUMMARY_XPATH
+    )
 
 
 class AmzProductDetails(AmzBase):
@@ -29,23 +48,12 @@ class AmzProductDetails(AmzBase):
         average_rating (float): Average star rating
     """
 
-    full_title = None
-    brand = None
-    brand_url = None
-    about_items = None
-    technical_details = None
-    product_description = None
-    image_urls = None
-    reviews_summary = None
-    star_distribution = None
-    review_count = None
-    average_rating = None
-
     _all_attrs = [
         'full_title', 'brand', 'brand_url', 'about_items',
         'technical_details', 'product_description', 'image_urls',
         'reviews_summary', 'star_distribution', 'review_count', 'average_rating'
     ]
+    __slots__ = tuple(_all_attrs)
 
     def __init__(self, html_element=None):
         """
@@ -65,36 +73,13 @@ class AmzProductDetails(AmzBase):
         Args:
             root: lxml HTML root element
         """
-        import re
-
-        try:
-            from amzsear.core.selectors import (
-                PRODUCT_TITLE, BRAND_LINK, FEATURE_BULLETS,
-                PRODUCT_DESCRIPTION, PRODUCT_DESCRIPTION_ALT,
-                TECH_DETAILS_TABLE, TECH_DETAILS_ROWS,
-                PRODUCT_DETAILS_TABLE, PRODUCT_DETAILS_TABLE_ALT,
-                IMAGE_GALLERY, MAIN_IMAGE, IMAGE_THUMB_LIST,
-                REVIEW_COUNT, RATING_STARS, STAR_HISTOGRAM,
-                CUSTOMER_REVIEWS_SUMMARY
-            )
-        except ImportError:
-            from .selectors import (
-                PRODUCT_TITLE, BRAND_LINK, FEATURE_BULLETS,
-                PRODUCT_DESCRIPTION, PRODUCT_DESCRIPTION_ALT,
-                TECH_DETAILS_TABLE, TECH_DETAILS_ROWS,
-                PRODUCT_DETAILS_TABLE, PRODUCT_DETAILS_TABLE_ALT,
-                IMAGE_GALLERY, MAIN_IMAGE, IMAGE_THUMB_LIST,
-                REVIEW_COUNT, RATING_STARS, STAR_HISTOGRAM,
-                CUSTOMER_REVIEWS_SUMMARY
-            )
-
         # Full title
-        title_elem = root.cssselect(PRODUCT_TITLE)
+        title_elem = PRODUCT_TITLE_XPATH(root)
         if title_elem:
             self.full_title = title_elem[0].text_content().strip()
 
         # Brand
-        brand_elem = root.cssselect(BRAND_LINK)
+        brand_elem = BRAND_LINK_XPATH(root)
         if brand_elem:
             self.brand = brand_elem[0].text_content().strip()
             # Remove "Visit the X Store" prefix if present
@@ -107,7 +92,7 @@ class AmzProductDetails(AmzBase):
                 self.brand_url = href
 
         # About this item bullet points
-        bullet_elems = root.cssselect(FEATURE_BULLETS)
+        bullet_elems = FEATURE_BULLETS_XPATH(root)
         if bullet_elems:
             self.about_items = []
             for elem in bullet_elems:
@@ -119,11 +104,11 @@ class AmzProductDetails(AmzBase):
         self.technical_details = {}
 
         # Try multiple selectors for tech details
-        for selector in [TECH_DETAILS_ROWS, PRODUCT_DETAILS_TABLE, PRODUCT_DETAILS_TABLE_ALT]:
-            rows = root.cssselect(selector)
+        for selector in [TECH_DETAILS_ROWS_XPATH, PRODUCT_DETAILS_TABLE_XPATH, PRODUCT_DETAILS_TABLE_ALT_XPATH]:
+            rows = selector(root)
             if rows:
                 for row in rows:
-                    cells = row.cssselect('th, td')
+                    cells = TABLE_CELLS_XPATH(row)
                     if len(cells) >= 2:
                         key = cells[0].text_content().strip()
                         value = cells[1].text_content().strip()
@@ -137,16 +122,16 @@ class AmzProductDetails(AmzBase):
             self.technical_details = None
 
         # Product description
-        desc_elem = root.cssselect(PRODUCT_DESCRIPTION)
+        desc_elem = PRODUCT_DESCRIPTION_XPATH(root)
         if not desc_elem:
-            desc_elem = root.cssselect(PRODUCT_DESCRIPTION_ALT)
+            desc_elem = PRODUCT_DESCRIPTION_ALT_XPATH(root)
         if desc_elem:
             self.product_description = desc_elem[0].text_content().strip()
 
         # Image URLs
         self.image_urls = []
-        for selector in [IMAGE_GALLERY, IMAGE_THUMB_LIST, MAIN_IMAGE]:
-            img_elems = root.cssselect(selector)
+        for selector in [IMAGE_GALLERY_XPATH, IMAGE_THUMB_LIST_XPATH, MAIN_IMAGE_XPATH]:
+            img_elems = selector(root)
             for img in img_elems:
                 src = img.get('src') or img.get('data-old-hires') or img.get('data-a-dynamic-image')
                 if src and src not in self.image_urls:
@@ -158,12 +143,12 @@ class AmzProductDetails(AmzBase):
             self.image_urls = None
 
         # Reviews summary (AI-generated)
-        summary_elem = root.cssselect(CUSTOMER_REVIEWS_SUMMARY)
+        summary_elem = CUSTOMER_REVIEWS_SUMMARY_XPATH(root)
         if summary_elem:
             self.reviews_summary = summary_elem[0].text_content().strip()
 
         # Review count
-        count_elem = root.cssselect(REVIEW_COUNT)
+        count_elem = REVIEW_COUNT_XPATH(root)
         if count_elem:
             count_text = count_elem[0].text_content().strip()
             # Extract number from text like "1,234 ratings" or "1,234 global ratings"
@@ -172,7 +157,7 @@ class AmzProductDetails(AmzBase):
                 self.review_count = int(match.group().replace(',', ''))
 
         # Average rating
-        rating_elem = root.cssselect(RATING_STARS)
+        rating_elem = RATING_STARS_XPATH(root)
         if rating_elem:
             rating_text = rating_elem[0].get('title', '') or rating_elem[0].text_content()
             match = re.search(r'(\d+\.?\d*)\s*out\s*of\s*5', rating_text)
@@ -180,7 +165,7 @@ class AmzProductDetails(AmzBase):
                 self.average_rating = float(match.group(1))
 
         # Star distribution
-        histogram = root.cssselect(STAR_HISTOGRAM)
+        histogram = STAR_HISTOGRAM_XPATH(root)
         if histogram:
             self.star_distribution = {}
             for row in histogram:
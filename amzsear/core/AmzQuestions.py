@@ -0,0 +1,134 @@
+"""
+AmzQuestion and AmzQuestions classes for storing customer questions and
+answers fetched from Amazon product Q&A pages.
+"""
+import copy
+import re
+
+try:
+    from amzsear.core.AmzBase import AmzBase
+    from amzsear.core.selectors import (QA_QUESTION_XPATH, QA_QUESTION_TEXT_XPATH, QA_ROW_XPATH,
+        QA_ROW_TEXT_XPATH, QA_ANSWER_BYLINE_XPATH)
+except ImportError:
+    from .AmzBase import AmzBase
+    from .selectors import (QA_QUESTION_XPATH, QA_QUESTION_TEXT_XPATH, QA_ROW_XPATH,
+        QA_ROW_TEXT_XPATH, QA_ANSWER_BYLINE_XPATH)
+
+
+def _clean_text(elem, exclude=None):
+    """
+    Get the text of an element with whitespace collapsed, spacing out child elements.
+
+    Args:
+        elem: lxml HTML element
+        exclude: A selector for descendants whose text is left out (optional)
+    """
+    if exclude is not None:
+        elem = copy.deepcopy(elem)
+        for child in exclude(elem):
+            child.drop_tree()
+    return re.sub(r'\s+', ' ', ' '.join(elem.itertext())).strip()
+
+
+class AmzQuestion(AmzBase):
+    """
+    Represents a single customer question and its answers.
+
+    Attributes:
+        question (str): The question text
+        answers (list): The answer texts, in page order
+    """
+
+    _all_attrs = ['question', 'answers']
+    __slots__ = tuple(_all_attrs)
+
+    def __init__(self, html_element=None):
+        """
+        Initialize AmzQuestion.
+
+        Args:
+            html_element: lxml HTML element for a single question (optional)
+        """
+        super().__init__()
+        if html_element is not None:
+            self._parse_from_html(html_element)
+
+    def _parse_from_html(self, elem):
+        """
+        Parse question data from HTML element.
+
+        Args:
+            elem: lxml HTML element for a single question
+        """
+        question_elem = QA_QUESTION_TEXT_XPATH(elem)
+        if not question_elem:
+            return
+        question_elem = question_elem[0]
+        self.question = _clean_text(question_elem)
+
+        # Each row has its label ("Question:", "Answer:" in the page's
+        #  language) on the left and its text on the right
+        answers = []
+        for row in QA_ROW_XPATH(elem):
+            if question_elem in row.iter():
+                continue
+            text_elem = QA_ROW_TEXT_XPATH(row)
+            if not text_elem:
+                continue
+            text = _clean_text(text_elem[0], exclude=QA_ANSWER_BYLINE_XPATH)
+            if text:
+                answers.append(text)
+        self.answers = answers
+
+        # Mark as valid if we have a question
+        if self.question:
+            self._is_valid = True
+
+
+class AmzQuestions(AmzBase):
+    """
+    Collection of customer questions for a product.
+
+    Attributes:
+        questions (list): List of AmzQuestion objects
+    """
+
+    _all_attrs = ['questions']
+    __slots__ = tuple(_all_attrs)
+
+    def __init__(self, html_element=None):
+        """
+        Initialize AmzQuestions.
+
+        Args:
+            html_element: lxml HTML element from Q&A page (optional)
+        """
+        super().__init__()
+        if html_element is not None:
+            self._parse_from_html(html_element)
+
+    def _parse_from_html(self, root):
+        """
+        Parse questions from HTML element.
+
+        Args:
+            root: lxml HTML root element from Q&A page
+        """
+        self.questions = []
+
+        for elem in QA_QUESTION_XPATH(root):
+            question = AmzQuestion(elem)
+            if question.is_valid():
+                self.questions.append(question)
+
+        # Mark as valid if we have questions
+        if self.questions:
+            self._is_valid = True
+
+    def __len__(self):
+        """Return number of questions."""
+        return len(self.questions) if self.questions else 0
+
+    def __iter__(self):
+        """Iterate over questions."""
+        return iter(self.questions) if self.questions else iter([])
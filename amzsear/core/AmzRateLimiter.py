@@ -0,0 +1,224 @@
+"""
+AmzRateLimiter class for pacing requests to each Amazon host.
+"""
+import asyncio
+import random
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from urllib import parse
+
+try:
+    from amzsear.core.consts import (RATE_LIMIT, RATE_BURST, MAX_RETRIES, BACKOFF_BASE, BACKOFF_MAX,
+        RETRY_STATUSES, THROTTLE_STATUSES, ADAPTIVE_RATE_STEP, ADAPTIVE_RATE_FACTOR,
+        ADAPTIVE_MIN_RATE, ADAPTIVE_MAX_RATE)
+except ImportError:
+    from .consts import (RATE_LIMIT, RATE_BURST, MAX_RETRIES, BACKOFF_BASE, BACKOFF_MAX,
+        RETRY_STATUSES, THROTTLE_STATUSES, ADAPTIVE_RATE_STEP, ADAPTIVE_RATE_FACTOR,
+        ADAPTIVE_MIN_RATE, ADAPTIVE_MAX_RATE)
+
+
+class AmzRateLimiter(object):
+    """
+    A token bucket rate limiter per host, with retries and backoff.
+
+    Each host (e.g. www.amazon.de) gets its own bucket of burst requests,
+    refilled at rate requests per second. Failed requests that are worth
+    retrying (connection errors, timeouts and the statuses in RETRY_STATUSES)
+    are retried after a jittered exponential backoff, or after the server's
+    Retry-After if it gives one. A throttled response (429 or 503) also
+    pauses the whole host for that long.
+
+    In adaptive mode the rate of each host starts at rate, grows by
+    ADAPTIVE_RATE_STEP after every successful request and is multiplied by
+    ADAPTIVE_RATE_FACTOR when throttled, settling just under the rate the
+    host accepts.
+
+    The limiter is opt-in and is enabled for all fetches with set_rate_limiter:
+
+        >>> from amzsear.core import set_rate_limiter
+        >>> set_rate_limiter(AmzRateLimiter(rate=2, adaptive=True))
+
+    Args:
+        rate (float): Requests per second per host (the starting rate in
+            adaptive mode).
+        burst (int): Requests allowed back to back before the rate applies.
+        retries (int): Retries of a failed request before giving up.
+        backoff (float): The backoff before the first retry in seconds,
+            doubled for each further retry.
+        max_backoff (float): The longest wait before a retry in seconds.
+            Requests are not retried if the server asks for a longer wait.
+        adaptive (bool): Whether to adapt the rate to throttling.
+        min_rate (float): The lowest rate in adaptive mode.
+        max_rate (float): The highest rate in adaptive mode.
+
+    Attributes:
+        retried (int): The number of requests retried.
+        throttled (int): The number of throttled responses.
+    """
+
+    def __init__(self, rate=RATE_LIMIT, burst=RATE_BURST, retries=MAX_RETRIES, backoff=BACKOFF_BASE,
+            max_backoff=BACKOFF_MAX, adaptive=False, min_rate=ADAPTIVE_MIN_RATE, max_rate=ADAPTIVE_MAX_RATE):
+        self.rate = rate
+        self.burst = burst
+        self.retries = retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.adaptive = adaptive
+        self.min_rate = min_rate
+        self.max_rate = max_rate
+        self.retried = 0
+        self.throttled = 0
+
+        self._lock = threading.Lock()
+        self._buckets = {}  # host -> [tokens, updated_at, rate, paused_until]
+
+    @staticmethod
+    def _host(url):
+        return parse.urlparse(url).netloc.lower()
+
+    def _bucket(self, host, now):
+        """Get the bucket of a host, refilled up to now. Must hold the lock."""
+        bucket = self._buckets.get(host)
+        if bucket is None:
+            bucket = self._buckets[host] = [float(self.burst), now, float(self.rate), now]
+        else:
+            tokens, updated_at, rate = bucket[:3]
+            bucket[0] = min(float(self.burst), tokens + (now - updated_at) * rate)
+            bucket[1] = now
+        return bucket
+
+    def get_rate(self, url):
+        """
+        Get the current rate for a URL's host.
+
+        Args:
+            url (str): A URL on the host.
+
+        Returns:
+            float: Requests per second.
+        """
+        with self._lock:
+            bucket = self._buckets.get(self._host(url))
+            return bucket[2] if bucket is not None else float(self.rate)
+
+    def reserve(self, url):
+        """
+        Take a token for a request to a URL, without waiting for it.
+
+        Tokens can be taken ahead of time, so concurrent callers each get
+        their own place in the queue.
+
+        Args:
+            url (str): The URL about to be fetched.
+
+        Returns:
+            float: The number of seconds to wait before making the request.
+        """
+        with self._lock:
+            bucket = self._bucket(self._host(url), time.monotonic())
+            bucket[0] -= 1
+            return -bucket[0] / bucket[2] if bucket[0] < 0 else 0.0
+
+    def acquire(self, url):
+        """Block until a request to a URL may be made."""
+        delay = self.reserve(url)
+        if delay > 0:
+            time.sleep(delay)
+
+    async def acquire_async(self, url):
+        """Wait on the event loop until a request to a URL may be made."""
+        delay = self.reserve(url)
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+    def success(self, url):
+        """
+        Record a successful request to a URL, raising the rate in adaptive mode.
+
+        Args:
+            url (str): The URL fetched.
+        """
+        if not self.adaptive:
+            return
+        with self._lock:
+            bucket = self._bucket(self._host(url), time.monotonic())
+            bucket[2] = min(self.max_rate, bucket[2] + ADAPTIVE_RATE_STEP)
+
+    def retry_delay(self, url, attempt, status=None, retry_after=None):
+        """
+        Record a failed request to a URL and decide whether to retry it.
+
+        Args:
+            url (str): The URL fetched.
+            attempt (int): The number of retries already made (0 for the
+                first attempt).
+            status (int): The HTTP status of the response, or None if no
+                response was received (connection error or timeout).
+            retry_after (str): The Retry-After header of the response.
+
+        Returns:
+            float or None: The number of seconds to wait before retrying, or
+                None if the request should not be retried.
+        """
+        if status is not None and status not in RETRY_STATUSES:
+            return None
+        if attempt >= self.retries:
+            return None
+
+        wait = self.parse_retry_after(retry_after)
+        if wait is None:
+            # Full jitter, so throttled clients do not retry in lockstep
+            wait = random.uniform(0, min(self.max_backoff, self.backoff * 2 ** attempt))
+        elif wait > self.max_backoff:
+            return None
+
+        with self._lock:
+            self.retried += 1
+            if status in THROTTLE_STATUSES:
+                self.throttled += 1
+                now = time.monotonic()
+                bucket = self._bucket(self._host(url), now)
+                # Requests already in flight when throttling started are
+                #  throttled too, so the rate is only lowered once per pause
+                if self.adaptive and now >= bucket[3]:
+                    bucket[2] = max(self.min_rate, bucket[2] * ADAPTIVE_RATE_FACTOR)
+                bucket[3] = max(bucket[3], now + wait)
+                # Hold back all requests to the host until the wait is over,
+                #  leaving one token for the retry
+                bucket[0] = min(bucket[0], 1 - wait * bucket[2])
+        return wait
+
+    @staticmethod
+    def parse_retry_after(value):
+        """
+        Parse a Retry-After header.
+
+        Args:
+            value (str): Either a number of seconds or an HTTP date.
+
+        Returns:
+            float or None: The number of seconds to wait, or None if value is
+                missing or invalid.
+        """
+        if not value:
+            return None
+        try:
+            return max(0.0, float(value))
+        except ValueError:
+            pass
+        try:
+            return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+        except (TypeError, ValueError):
+            return None
+
+    def stats(self):
+        """
+        Get rate limiter statistics.
+
+        Returns:
+            dict: retried, throttled and the current rate of each host.
+        """
+        with self._lock:
+            rates = {host: bucket[2] for host, bucket in self._buckets.items()}
+        return {'retried': self.retried, 'throttled': self.throttled, 'rates': rates}
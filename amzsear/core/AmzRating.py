@@ -3,9 +3,11 @@ import re
 try:
     from amzsear.core.AmzBase import AmzBase
     from amzsear.core import requires_valid_data, capture_exception
+    from amzsear.core.selectors import RESULT_RATING_STARS_XPATH, RESULT_RATING_COUNT_XPATH
 except ImportError:
     from .AmzBase import AmzBase
     from . import requires_valid_data, capture_exception
+    from .selectors import RESULT_RATING_STARS_XPATH, RESULT_RATING_COUNT_XPATH
 
 
 class AmzRating(AmzBase):
@@ -24,8 +26,7 @@ class AmzRating(AmzBase):
         html_element (lxml.html.HtmlElement): A root for an HTML tree derived from
             an element on an Amazon search page.
     """
-    ratings_text = None
-    ratings_count_text = None
+    __slots__ = ('ratings_text', 'ratings_count_text')
     _all_attrs = ['ratings_text', 'ratings_count_text']
 
     def __init__(self, html_element=None):
@@ -57,8 +58,8 @@ class AmzRating(AmzBase):
         Returns:
             tuple: Tuple of (ratings_text, ratings_count_text) as strings.
         """
-        ratings_text = root.cssselect('i[class*="star"]')[0].text_content()
-        ratings_count_text = root.cssselect('a[href*="customerReviews"]')[0].text_content()
+        ratings_text = RESULT_RATING_STARS_XPATH(root)[0].text_content()
+        ratings_count_text = RESULT_RATING_COUNT_XPATH(root)[0].text_content()
         return (ratings_text, ratings_count_text)
 
     def _extract_all_values(self, data=None):
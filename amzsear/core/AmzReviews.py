@@ -3,11 +3,28 @@ AmzReview and AmzReviews classes for storing customer review data
 fetched from Amazon product review pages.
 """
 import re
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
 
 try:
     from amzsear.core.AmzBase import AmzBase
+    from amzsear.core import build_base_url, fetch_content, parse_content
+    from amzsear.core.consts import REVIEWS_PAGE_URL, DEFAULT_REGION
+    from amzsear.core.selectors import (
+        REVIEW_ITEM_XPATH, REVIEW_TITLE_XPATH, REVIEW_RATING_XPATH,
+        REVIEW_DATE_XPATH, REVIEW_BODY_XPATH, REVIEW_AUTHOR_XPATH,
+        REVIEW_VERIFIED_XPATH, REVIEW_HELPFUL_XPATH, REVIEW_IMAGES_XPATH,
+        REVIEW_COUNT_XPATH, REVIEW_FEATURE_BUTTONS_XPATH
+    )
 except ImportError:
     from .AmzBase import AmzBase
+    from . import build_base_url, fetch_content, parse_content
+    from .consts import REVIEWS_PAGE_URL, DEFAULT_REGION
+    from .selectors import (
+        REVIEW_ITEM_XPATH, REVIEW_TITLE_XPATH, REVIEW_RATING_XPATH,
+        REVIEW_DATE_XPATH, REVIEW_BODY_XPATH, REVIEW_AUTHOR_XPATH,
+        REVIEW_VERIFIED_XPATH, REVIEW_HELPFUL_XPATH, REVIEW_IMAGES_XPATH,
+        REVIEW_COUNT_XPATH, REVIEW_FEATURE_BUTTONS_XPATH
+    )
 
 
 class AmzReview(AmzBase):
@@ -15,6 +32,7 @@ class AmzReview(AmzBase):
     Represents a single customer review.
 
     Attributes:
+        review_id (str): Amazon's id for the review (e.g. "R2QX1ZJ3KQ5N7B")
         reviewer (str): Reviewer's display name
         rating (float): Star rating (1-5)
         title (str): Review title
@@ -25,19 +43,11 @@ class AmzReview(AmzBase):
         images (list): URLs to images attached to review
     """
 
-    reviewer = None
-    rating = None
-    title = None
-    date = None
-    text = None
-    verified = None
-    helpful_count = None
-    images = None
-
     _all_attrs = [
-        'reviewer', 'rating', 'title', 'date',
+        'review_id', 'reviewer', 'rating', 'title', 'date',
         'text', 'verified', 'helpful_count', 'images'
     ]
+    __slots__ = tuple(_all_attrs)
 
     def __init__(self, html_element=None):
         """
@@ -57,26 +67,16 @@ class AmzReview(AmzBase):
         Args:
             elem: lxml HTML element for a single review
         """
-        try:
-            from amzsear.core.selectors import (
-                REVIEW_TITLE, REVIEW_RATING, REVIEW_DATE,
-                REVIEW_BODY, REVIEW_AUTHOR, REVIEW_VERIFIED,
-                REVIEW_HELPFUL, REVIEW_IMAGES
-            )
-        except ImportError:
-            from .selectors import (
-                REVIEW_TITLE, REVIEW_RATING, REVIEW_DATE,
-                REVIEW_BODY, REVIEW_AUTHOR, REVIEW_VERIFIED,
-                REVIEW_HELPFUL, REVIEW_IMAGES
-            )
+        # Review id (the id of the review element)
+        self.review_id = elem.get('id') or None
 
         # Reviewer name
-        author_elem = elem.cssselect(REVIEW_AUTHOR)
+        author_elem = REVIEW_AUTHOR_XPATH(elem)
         if author_elem:
             self.reviewer = author_elem[0].text_content().strip()
 
         # Rating
-        rating_elem = elem.cssselect(REVIEW_RATING)
+        rating_elem = REVIEW_RATING_XPATH(elem)
         if rating_elem:
             rating_text = rating_elem[0].text_content()
             match = re.search(r'(\d+\.?\d*)\s*out\s*of\s*5', rating_text)
@@ -84,7 +84,7 @@ class AmzReview(AmzBase):
                 self.rating = float(match.group(1))
 
         # Title
-        title_elem = elem.cssselect(REVIEW_TITLE)
+        title_elem = REVIEW_TITLE_XPATH(elem)
         if title_elem:
             # Title often includes rating text, extract just the title
             title_text = title_elem[0].text_content().strip()
@@ -93,7 +93,7 @@ class AmzReview(AmzBase):
             self.title = title_text.strip()
 
         # Date
-        date_elem = elem.cssselect(REVIEW_DATE)
+        date_elem = REVIEW_DATE_XPATH(elem)
         if date_elem:
             date_text = date_elem[0].text_content().strip()
             # Extract date from text like "Reviewed in the United States on December 3, 2024"
@@ -104,16 +104,16 @@ class AmzReview(AmzBase):
                 self.date = date_text
 
         # Review text
-        body_elem = elem.cssselect(REVIEW_BODY)
+        body_elem = REVIEW_BODY_XPATH(elem)
         if body_elem:
             self.text = body_elem[0].text_content().strip()
 
         # Verified purchase
-        verified_elem = elem.cssselect(REVIEW_VERIFIED)
+        verified_elem = REVIEW_VERIFIED_XPATH(elem)
         self.verified = len(verified_elem) > 0
 
         # Helpful count
-        helpful_elem = elem.cssselect(REVIEW_HELPFUL)
+        helpful_elem = REVIEW_HELPFUL_XPATH(elem)
         if helpful_elem:
             helpful_text = helpful_elem[0].text_content()
             match = re.search(r'([\d,]+)\s*people?\s*found', helpful_text)
@@ -127,7 +127,7 @@ class AmzReview(AmzBase):
             self.helpful_count = 0
 
         # Review images
-        img_elems = elem.cssselect(REVIEW_IMAGES)
+        img_elems = REVIEW_IMAGES_XPATH(elem)
         if img_elems:
             self.images = []
             for img in img_elems:
@@ -141,6 +141,12 @@ class AmzReview(AmzBase):
         if self.text or self.title:
             self._is_valid = True
 
+    def _dedup_key(self):
+        """The key identifying a review across pages."""
+        if self.review_id:
+            return self.review_id
+        return (self.reviewer, self.title, self.date, self.text)
+
 
 class AmzReviews(AmzBase):
     """
@@ -152,11 +158,8 @@ class AmzReviews(AmzBase):
         feature_ratings (dict): Feature-specific ratings (e.g., {"Sound quality": 4.5})
     """
 
-    reviews = None
-    total_count = None
-    feature_ratings = None
-
     _all_attrs = ['reviews', 'total_count', 'feature_ratings']
+    __slots__ = tuple(_all_attrs)
 
     def __init__(self, html_element=None):
         """
@@ -176,13 +179,8 @@ class AmzReviews(AmzBase):
         Args:
             root: lxml HTML root element from reviews page
         """
-        try:
-            from amzsear.core.selectors import REVIEW_ITEM, REVIEW_COUNT
-        except ImportError:
-            from .selectors import REVIEW_ITEM, REVIEW_COUNT
-
         # Parse individual reviews
-        review_elems = root.cssselect(REVIEW_ITEM)
+        review_elems = REVIEW_ITEM_XPATH(root)
         if review_elems:
             self.reviews = []
             for elem in review_elems:
@@ -194,7 +192,7 @@ class AmzReviews(AmzBase):
             self.reviews = []
 
         # Total count
-        count_elem = root.cssselect(REVIEW_COUNT)
+        count_elem = REVIEW_COUNT_XPATH(root)
         if count_elem:
             count_text = count_elem[0].text_content()
             match = re.search(r'[\d,]+', count_text)
@@ -203,7 +201,7 @@ class AmzReviews(AmzBase):
 
         # Feature ratings (these are often in a separate widget)
         # Look for feature rating buttons
-        feature_buttons = root.cssselect('[data-hook="cr-insights-widget-aspects"] button')
+        feature_buttons = REVIEW_FEATURE_BUTTONS_XPATH(root)
         if feature_buttons:
             self.feature_ratings = {}
             for btn in feature_buttons:
@@ -222,6 +220,123 @@ class AmzReviews(AmzBase):
         if self.reviews:
             self._is_valid = True
 
+    @classmethod
+    def fetch_reviews(cls, asin, max_pages=10, concurrency=4, region=DEFAULT_REGION, session=None):
+        """
+        Fetch several pages of reviews concurrently and merge them.
+
+        Pages are fetched concurrency at a time, and no further pages are
+        requested once a page without reviews is found.
+
+        Args:
+            asin (str): The ASIN of the product.
+            max_pages (int): The maximum number of review pages to fetch.
+            concurrency (int): The number of pages fetched at once.
+            region (str): The Amazon region/country (defaults to US).
+            session (requests.Session): A session to fetch pages with (defaults
+                to the shared per-host connection pool).
+
+        Returns:
+            AmzReviews: The reviews of all pages in page order, without
+                duplicates (see merge).
+
+        Raises:
+            FetchError: If fetching any page fails.
+        """
+        pages = dict(cls._iter_pages(asin, max_pages, concurrency, region, session))
+        return cls.merge([pages[n] for n in sorted(pages)])
+
+    @classmethod
+    def iter_reviews(cls, asin, max_pages=10, concurrency=4, region=DEFAULT_REGION, session=None):
+        """
+        Fetch pages of reviews concurrently, yielding reviews as each page arrives.
+
+        Takes the same arguments as fetch_reviews. Reviews are yielded in the
+        order pages arrive (not necessarily page order), without duplicates.
+        Closing the generator (e.g. by breaking out of a for loop) stops any
+        further pages from being requested.
+
+        Yields:
+            AmzReview: Each review, once.
+
+        Raises:
+            FetchError: If fetching any page fails.
+        """
+        seen = set()
+        for _, page in cls._iter_pages(asin, max_pages, concurrency, region, session):
+            for review in page.reviews:
+                key = review._dedup_key()
+                if key not in seen:
+                    seen.add(key)
+                    yield review
+
+    @classmethod
+    def _iter_pages(cls, asin, max_pages, concurrency, region, session):
+        """Yield (page number, AmzReviews) tuples as review pages arrive."""
+        base_url = build_base_url(region)
+
+        def fetch_page(page_num):
+            content = fetch_content(REVIEWS_PAGE_URL % (base_url, asin, page_num), session=session)
+            return parse_content(content, cls)
+
+        concurrency = max(1, concurrency)
+        executor = ThreadPoolExecutor(max_workers=concurrency)
+        pending = {}  # future -> page number
+        next_page = 1
+        last_page = max_pages
+        try:
+            while True:
+                while next_page <= last_page and len(pending) < concurrency:
+                    pending[executor.submit(fetch_page, next_page)] = next_page
+                    next_page += 1
+                if not pending:
+                    break
+
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    page_num = pending.pop(future)
+                    page = future.result()
+                    if not page.reviews:
+                        # Amazon serves empty pages past the last page of reviews
+                        last_page = min(last_page, page_num - 1)
+                    yield page_num, page
+        finally:
+            for future in pending:
+                future.cancel()
+            executor.shutdown(wait=False)
+
+    @classmethod
+    def merge(cls, reviews):
+        """
+        Merge several AmzReviews objects (e.g. pages of reviews) into a new one.
+
+        Reviews keep their order, and the first occurrence of a review id
+        wins. The total count and feature ratings are taken from the first
+        object that has them.
+
+        Args:
+            reviews (iterable): AmzReviews objects to merge.
+
+        Returns:
+            AmzReviews: The merged reviews.
+        """
+        merged = cls()
+        merged.reviews = []
+        seen = set()
+        for page in reviews:
+            for review in page.reviews or []:
+                key = review._dedup_key()
+                if key not in seen:
+                    seen.add(key)
+                    merged.reviews.append(review)
+            if merged.total_count is None:
+                merged.total_count = page.total_count
+            if merged.feature_ratings is None:
+                merged.feature_ratings = page.feature_ratings
+        if merged.reviews:
+            merged._is_valid = True
+        return merged
+
     def __len__(self):
         """Return number of reviews."""
         return len(self.reviews) if self.reviews else 0
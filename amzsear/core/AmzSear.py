@@ -1,13 +1,23 @@
-from lxml import html as html_module
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, as_completed
 
 try:
-    from amzsear.core import build_url, fetch_html
+    from amzsear.core import build_url, get_iter, fetch_content, parse_content, parse_numbers, iter_subtrees, FetchError
     from amzsear.core.consts import DEFAULT_REGION
     from amzsear.core.AmzProduct import AmzProduct
+    from amzsear.core.selectors import DetailLevel, SEARCH_RESULT_XPATH, SEARCH_RESULT_SELF_XPATH, SEARCH_RESULT_TAG, RESULT_TITLE_XPATH
 except ImportError:
-    from . import build_url, fetch_html
+    from . import build_url, get_iter, fetch_content, parse_content, parse_numbers, iter_subtrees, FetchError
     from .consts import DEFAULT_REGION
     from .AmzProduct import AmzProduct
+    from .selectors import DetailLevel, SEARCH_RESULT_XPATH, SEARCH_RESULT_SELF_XPATH, SEARCH_RESULT_TAG, RESULT_TITLE_XPATH
+
+# Ways of combining several prices of one product in price_array
+_AGGREGATES = {
+    'min': min,
+    'max': max,
+    'mean': lambda x: sum(x) / len(x),
+}
 
 
 class AmzSear(object):
@@ -36,56 +46,65 @@ class AmzSear(object):
         html (str or iterable): The HTML code from an Amazon search page.
         html_element (lxml element or iterable): The lxml root generated from HTML.
         products (list): A list of AmzProducts.
+        session (requests.Session): A session to fetch pages with (defaults
+            to the shared per-host connection pool).
+        max_workers (int): The number of pages fetched in parallel (defaults
+            to 1, fetching pages one after another). Page order is kept.
+        fields (iterable): Only extract these AmzProduct fields from each
+            search result (title and product_url are always extracted).
+        lazy (bool): If True, product fields are extracted on first access
+            (see AmzProduct).
 
     Note: All arg types can be an iterable of that type. For example,
     page can be an int, list, or range of ints to be searched.
     """
+    _repr_index_len = 12  # ASIN is 10 chars + padding
 
-    def __init__(self, query=None, page=1, region=DEFAULT_REGION, url=None, html=None, html_element=None, products=None):
-        def get_iter(it):
-            if not hasattr(it, '__iter__') or isinstance(it, str):
-                return [it]
-            else:
-                return it
-
+    def __init__(self, query=None, page=1, region=DEFAULT_REGION, url=None, html=None, html_element=None, products=None, session=None, max_workers=1,
+            fields=None, lazy=False):
         self._products = []
         self._indexes = []
+        self._index_map = {}  # ASIN -> AmzProduct, for constant time lookups
         self._urls = []
+        self._arrays = {}  # cached price_array/rating_array results
 
         if query is not None:
             page = get_iter(page)
             url = [build_url(query=query, page_num=p, region=region) for p in page]
+        executor = None
         if url is not None:
-            url = get_iter(url)
+            url = list(get_iter(url))
             self._urls = url
-            html_element = []
-            for u in url:
-                elem = fetch_html(build_url(u))
-                if elem is not None:
-                    html_element.append(elem)
+            fetch = lambda u: fetch_content(build_url(u), session=session)
+            # Pages are parsed in order as they arrive, so each is released
+            #  once its products are built rather than all being held at once
+            if max_workers > 1 and len(url) > 1:
+                executor = ThreadPoolExecutor(max_workers=min(max_workers, len(url)))
+                html = executor.map(fetch, url)
+            else:
+                html = (fetch(u) for u in url)
+        if fields is not None:
+            fields = tuple(fields)
         if html is not None:
-            html = get_iter(html)
-            html_element = [html_module.fromstring(h) for h in html]
-        if html_element is not None:
-            html_element = get_iter(html_element)
+            # Parsed from the raw page so identical pages can be memoized (see set_memo)
+            products = []
+            try:
+                for h in get_iter(html):
+                    products.extend(parse_content(h, self._parse_page_products, region, fields, lazy, raw=True))
+            finally:
+                if executor is not None:
+                    html.close()  # cancels pages not yet fetched if parsing failed
+                    executor.shutdown()
+        elif html_element is not None:
             products = []
-            for html_el in html_element:
-                page_products = html_el.cssselect('div[data-asin][data-component-type="s-search-result"]')
-                page_products = [x for x in page_products if x.cssselect('h2')]
-                page_products = [AmzProduct(elem, region=region) for elem in page_products]
-                products.extend(page_products)
+            for html_el in get_iter(html_element):
+                products.extend(self._get_page_products(html_el, region, fields, lazy))
         if products is not None:
-            products = get_iter(products)
-            products = [prod for prod in products if prod.is_valid() and prod._index]
-            # Deduplicate by ASIN - keep first occurrence only
-            for prod in products:
-                if prod._index not in self._indexes:
-                    self._products.append(prod)
-                    self._indexes.append(prod._index)
+            self._add_products(get_iter(products))
 
     def __repr__(self):
         out = []
-        max_index_len = 12  # ASIN is 10 chars + padding
+        max_index_len = self._repr_index_len
         for index, product in self.items():
             temp_repr = repr(index) + ':' + max_index_len*' '
             temp_repr = temp_repr[:max_index_len] + repr(product)
@@ -99,6 +118,174 @@ class AmzSear(object):
     def __iter__(self):
         return iter(self._indexes)
 
+    def __contains__(self, key):
+        return self._normalize_key(key) in self._index_map
+
+    def __or__(self, other):
+        if not isinstance(other, AmzSear):
+            return NotImplemented
+        return self.merge([self, other])
+
+    def __ior__(self, other):
+        if not isinstance(other, AmzSear):
+            return NotImplemented
+        self._add_products(other._products)
+        self._urls = list(self._urls) + list(other._urls)
+        return self
+
+    @classmethod
+    def iter_products(cls, query=None, page=1, region=DEFAULT_REGION, url=None, session=None, prefetch=1,
+            fields=None, lazy=False):
+        """
+        Lazily search, yielding products as each page arrives.
+
+        Pages are fetched in order; while the products of a page are yielded,
+        the next prefetch pages are fetched in the background. No further
+        pages are requested once the generator is closed (e.g. by breaking out
+        of a for loop), and iteration stops at the first page without any
+        search results, so page can be unbounded (e.g. itertools.count(1)).
+        Products are deduplicated by ASIN as in the constructor.
+
+        Args:
+            query (str): A search query to look up on Amazon.
+            page (int or iterable): The page number(s) of the query (defaults to 1).
+            region (str): The Amazon region/country to search (defaults to US).
+            url (str or iterable): Amazon search url(s), used if no query is given.
+            session (requests.Session): A session to fetch pages with (defaults
+                to the shared per-host connection pool).
+            prefetch (int): The number of pages fetched ahead of the consumer.
+            fields (iterable): Only extract these AmzProduct fields.
+            lazy (bool): If True, extract product fields on first access.
+
+        Yields:
+            AmzProduct: Each valid product, in page order.
+
+        Example:
+            >>> for product in AmzSear.iter_products('Harry Potter', page=range(1, 21)):
+            ...     if product.get_prices() and product.get_prices()[0] < 10:
+            ...         break
+        """
+        if query is not None:
+            url = (build_url(query=query, page_num=p, region=region) for p in get_iter(page))
+        if url is None:
+            return
+        url = iter(get_iter(url))
+        if fields is not None:
+            fields = tuple(fields)
+
+        executor = ThreadPoolExecutor(max_workers=max(1, prefetch))
+        pending = deque()
+        seen = set()
+
+        def fetch_next():
+            u = next(url, None)
+            if u is None:
+                return False
+            pending.append(executor.submit(fetch_content, build_url(u), session=session))
+            return True
+
+        try:
+            fetch_next()
+            while pending:
+                content = pending.popleft().result()
+                page_products = parse_content(content, cls._parse_page_products, region, fields, lazy, raw=True)
+                if not page_products:
+                    break
+
+                # Only fetch ahead once this page is known to have results
+                while len(pending) < prefetch and fetch_next():
+                    pass
+                for prod in page_products:
+                    if prod.is_valid() and prod._index and prod._index not in seen:
+                        seen.add(prod._index)
+                        yield prod
+                if not pending:
+                    fetch_next()
+        finally:
+            for future in pending:
+                future.cancel()
+            executor.shutdown(wait=False)
+
+    @staticmethod
+    def _get_page_products(html_element, region=DEFAULT_REGION, fields=None, lazy=False):
+        """Build an AmzProduct for each search result on a page."""
+        page_products = SEARCH_RESULT_XPATH(html_element)
+        page_products = [x for x in page_products if RESULT_TITLE_XPATH(x)]
+        return [AmzProduct(elem, region=region, fields=fields, lazy=lazy) for elem in page_products]
+
+    @staticmethod
+    def _parse_page_products(content, region=DEFAULT_REGION, fields=None, lazy=False):
+        """
+        Build an AmzProduct for each search result on a raw page.
+
+        As _get_page_products, but the page is parsed incrementally and only
+        the search results are kept (see iter_subtrees), so the page's tree
+        is never held in full and lazy products only keep their own result.
+        """
+        return [AmzProduct(elem, region=region, fields=fields, lazy=lazy)
+            for elem in iter_subtrees(content, SEARCH_RESULT_SELF_XPATH, tag=SEARCH_RESULT_TAG)
+            if RESULT_TITLE_XPATH(elem)]
+
+    def _add_products(self, products):
+        """Add valid products in order, keeping the first occurrence of each ASIN."""
+        self._arrays.clear()
+        for prod in products:
+            if not (prod.is_valid() and prod._index):
+                continue
+            key = self._product_key(prod)
+            if key not in self._index_map:
+                self._index_map[key] = prod
+                self._products.append(prod)
+                self._indexes.append(key)
+
+    def _product_key(self, prod):
+        """The index of a product, which is its ASIN."""
+        return prod._index
+
+    def _normalize_key(self, key):
+        """Convert a key passed to get (or in) to the form of the indexes."""
+        return str(key)
+
+    @classmethod
+    def merge(cls, searches):
+        """
+        Merge several AmzSear objects into a new one.
+
+        Products keep their order, and the first occurrence of an ASIN wins,
+        as with the products constructor argument. Calling a | b is equivalent
+        to AmzSear.merge([a, b]), and a |= b merges b into a in place.
+
+        Args:
+            searches (iterable): AmzSear objects to merge.
+
+        Returns:
+            AmzSear: A new object with the products of all searches.
+        """
+        merged = cls()
+        for amz in searches:
+            merged._add_products(amz._products)
+            merged._urls.extend(amz._urls)
+        return merged
+
+    @classmethod
+    def multi_region(cls, query, regions=None, page=1, max_workers=16, session=None, fields=None, lazy=False):
+        """
+        Search several Amazon regions concurrently.
+
+        Equivalent to AmzMultiSear.search, see AmzMultiSear for the arguments.
+
+        Returns:
+            AmzMultiSear: The products of all regions, indexed by (region, ASIN),
+                with any failed regions in its errors attribute.
+        """
+        # Imported here as AmzMultiSear extends this class
+        try:
+            from amzsear.core.AmzMultiSear import AmzMultiSear
+        except ImportError:
+            from .AmzMultiSear import AmzMultiSear
+        return AmzMultiSear.search(query, regions=regions, page=page, max_workers=max_workers,
+            session=session, fields=fields, lazy=lazy)
+
     def __len__(self):
         return len(self._products)
 
@@ -126,14 +313,14 @@ class AmzSear(object):
         Returns:
             The AmzProduct at the key, otherwise the default value.
         """
-        key = str(key)
-        if key not in self._indexes:
+        key = self._normalize_key(key)
+        if key not in self._index_map:
             if raise_error:
                 raise KeyError(f'The key {repr(key)} is not a known index')
             else:
                 return default
 
-        return self._products[self._indexes.index(key)]
+        return self._index_map[key]
 
     def rget(self, key, default=None, raise_error=False):
         """
@@ -174,18 +361,16 @@ class AmzSear(object):
         if not isinstance(key, list):
             key = [key]
 
+        missing = object()
         data = []
-        for i, k in enumerate(key):
-            data.append([])
-            curr_out = data[i]
-
-            for index, prod in self.items():
-                if hasattr(prod, k):
-                    curr_out.append(getattr(prod, k))
-                elif raise_error:
-                    raise ValueError(f'The key {repr(k)} is not available at index {repr(index)}')
-                else:
-                    curr_out.append(default)
+        for k in key:
+            column = self._column(k, missing)
+            for i, value in enumerate(column):
+                if value is missing:
+                    if raise_error:
+                        raise ValueError(f'The key {repr(k)} is not available at index {repr(self._indexes[i])}')
+                    column[i] = default
+            data.append(column)
 
         return list(zip(*data))
 
@@ -219,6 +404,157 @@ class AmzSear(object):
     keys = indexes
     values = products
 
+    def fetch_all_details(self, level=None, max_workers=8, session=None):
+        """
+        Fetch detailed information for every product concurrently.
+
+        All pages needed by every product (see AmzProduct.fetch_details) are
+        fetched on one bounded thread pool. A failed fetch is recorded in
+        that product's _fetch_error and does not stop the other fetches.
+
+        Args:
+            level (DetailLevel): How much detail to fetch (defaults to BASIC).
+            max_workers (int): The maximum number of requests in flight.
+            session (requests.Session): A session to fetch pages with (defaults
+                to the shared per-host connection pool).
+
+        Returns:
+            self: Returns self for method chaining
+        """
+        for _ in self.iter_fetch_details(level=level, max_workers=max_workers, session=session):
+            pass
+        return self
+
+    def iter_fetch_details(self, level=None, max_workers=8, session=None):
+        """
+        Fetch detailed information for every product, yielding as they complete.
+
+        Works as fetch_all_details, but each AmzProduct is yielded as soon as
+        all of its pages have been fetched and parsed. Requests not yet started
+        are cancelled if the generator is closed early.
+
+        Args:
+            level (DetailLevel): How much detail to fetch (defaults to BASIC).
+            max_workers (int): The maximum number of requests in flight.
+            session (requests.Session): A session to fetch pages with (defaults
+                to the shared per-host connection pool).
+
+        Yields:
+            AmzProduct: Each product once its details have been fetched.
+        """
+        if level is None:
+            level = DetailLevel.BASIC
+
+        executor = ThreadPoolExecutor(max_workers=max_workers)
+        futures = {}
+        remaining = {}
+        try:
+            for prod in self._products:
+                plan = prod._get_fetch_plan(level)
+                remaining[id(prod)] = len(plan)
+                if plan:
+                    prod._fetch_error = None
+                for attr, url, parser in plan:
+                    future = executor.submit(fetch_content, url, session=session)
+                    futures[future] = (prod, attr, parser)
+
+            for future in as_completed(futures):
+                prod, attr, parser = futures[future]
+                try:
+                    setattr(prod, attr, parse_content(future.result(), parser))
+                except FetchError as e:
+                    if prod._fetch_error is None:
+                        prod._fetch_error = str(e)
+
+                remaining[id(prod)] -= 1
+                if remaining[id(prod)] == 0:
+                    yield prod
+        finally:
+            for future in futures:
+                future.cancel()
+            executor.shutdown(wait=True)
+
+    def price_array(self, key=None, agg='min'):
+        """
+        Get the prices of all products as a NumPy array.
+
+        NumPy must be installed for this method to be called. The price text
+        of every product is parsed once with its region's decimal separator,
+        and the array is cached until more products are added.
+
+        Args:
+            key (str or list): A key or list of keys in the price dictionary
+                (defaults to all prices).
+            agg (str): How several prices of a product are combined, one of
+                'min', 'max' or 'mean'.
+
+        Returns:
+            numpy.ndarray: A read-only float array with one price per product,
+                in product order (NaN if a product has no matching price).
+        """
+        if agg not in _AGGREGATES:
+            raise ValueError(f'{repr(agg)} is not one of {list(_AGGREGATES)}')
+        if key is not None and not isinstance(key, list):
+            key = [key]
+        cache_key = ('price', None if key is None else tuple(key), agg)
+        if cache_key not in self._arrays:
+            combine = _AGGREGATES[agg]
+            values = []
+            for prod in self._products:
+                prices = prod.prices or {}
+                numbers = []
+                for k in (prices if key is None else key):
+                    numbers += parse_numbers(prices.get(k), prod._region)
+                values.append(combine(numbers) if numbers else float('nan'))
+            self._arrays[cache_key] = self._to_array(values)
+        return self._arrays[cache_key]
+
+    def rating_array(self, value='stars'):
+        """
+        Get the ratings of all products as a NumPy array.
+
+        NumPy must be installed for this method to be called. The rating text
+        of every product is parsed once with its region's decimal separator,
+        and the array is cached until more products are added.
+
+        Args:
+            value (str): The rating value to get, one of 'stars' (e.g. 4.5),
+                'perc' (stars out of the maximum, 0.0 to 1.0) or 'count'
+                (the number of ratings).
+
+        Returns:
+            numpy.ndarray: A read-only float array with one value per product,
+                in product order (NaN if a product has no rating).
+        """
+        if value not in ('stars', 'perc', 'count'):
+            raise ValueError(f"{repr(value)} is not one of ['stars', 'perc', 'count']")
+        cache_key = ('rating', value)
+        if cache_key not in self._arrays:
+            values = []
+            for prod in self._products:
+                rating = prod.rating
+                if rating is None or not rating.is_valid():
+                    values.append(float('nan'))
+                elif value == 'count':
+                    count = parse_numbers(rating.ratings_count_text, prod._region)
+                    values.append(count[0] if count else float('nan'))
+                else:
+                    stars = sorted(parse_numbers(rating.ratings_text, prod._region))
+                    if not stars or (value == 'perc' and stars[-1] == 0):
+                        values.append(float('nan'))
+                    else:
+                        values.append(stars[0] / stars[-1] if value == 'perc' else stars[0])
+            self._arrays[cache_key] = self._to_array(values)
+        return self._arrays[cache_key]
+
+    @staticmethod
+    def _to_array(values):
+        """Build a read-only float array, so cached arrays can be shared safely."""
+        import numpy as np
+        arr = np.array(values, dtype=np.float64)
+        arr.flags.writeable = False
+        return arr
+
     def to_dataframe(self, recursive=True, flatten=False):
         """
         Convert to a Pandas DataFrame.
@@ -227,14 +563,106 @@ class AmzSear(object):
 
         Args:
             recursive (bool): See AmzBase.to_dict method.
-            flatten (bool): See AmzBase.to_dict method.
+            flatten (bool): See AmzBase.to_dict method (dict attributes such
+                as prices are also split into columns, see to_columns).
 
         Returns:
             pandas.DataFrame: A dataframe with each product in a row,
                 indexed by ASIN.
         """
         from pandas import DataFrame
-        return DataFrame(
-            [y.to_series(recursive=recursive, flatten=flatten) for x, y in self.items()],
-            index=self._indexes
-        ) 
+        # Missing values are NaN, as pandas fills them when building from rows
+        columns = self.to_columns(recursive=recursive, flatten=flatten, missing=float('nan'))
+        return DataFrame(columns, index=self._indexes)
+
+    def to_records(self, recursive=True, flatten=True):
+        """
+        Convert to a list of dicts, one per product.
+
+        Each record starts with the product's index (its asin) followed by the
+        product's to_dict, so with flatten=True (the default) every record is
+        flat and ready for a CSV writer, a database or JSON lines.
+
+        Args:
+            recursive (bool): See AmzBase.to_dict method.
+            flatten (bool): See AmzBase.to_dict method.
+
+        Returns:
+            list: A dict per product, in product order.
+        """
+        return [prod._to_dict_into(self._index_fields(key), recursive=recursive, flatten=flatten)
+            for key, prod in zip(self._indexes, self._products)]
+
+    def _index_fields(self, key):
+        """The fields identifying a product in to_records."""
+        return {'asin': key}
+
+    def to_columns(self, recursive=True, flatten=False, missing=None):
+        """
+        Convert to a columnar dict, with one list of values per attribute.
+
+        Columns are built one attribute at a time, each list holding one value
+        per product in product order. Columns are the keys of the products'
+        to_dict, so flatten=True gives the nested rating values their own
+        columns; it also splits dict attributes (e.g. prices) into one
+        column per key, named like 'prices.Paperback', sorted by key in
+        the attribute's place.
+
+        Args:
+            recursive (bool): See AmzBase.to_dict method.
+            flatten (bool): See AmzBase.to_dict method.
+            missing: The value where a product has no value for a column.
+
+        Returns:
+            dict: Attribute names mapped to lists of values.
+        """
+        groups = []
+        for name in self._attr_names():
+            values = self._column(name, None)
+            first = next((i for i, v in enumerate(values) if v is not None), None)
+            if first is None:
+                continue
+            present = [v for v in values if v is not None]
+            columns = {}
+            if recursive and any(hasattr(v, 'to_dict') for v in present):
+                values = [v.to_dict() if hasattr(v, 'to_dict') else v for v in values]
+                if flatten:
+                    self._add_dict_columns(columns, values, missing)
+                    groups.append((first, columns))
+                    continue
+            elif flatten and all(isinstance(v, dict) for v in present):
+                self._add_dict_columns(columns, values, missing, prefix=name + '.')
+                # Sorted, so the columns do not depend on the first product's keys
+                groups.append((first, dict(sorted(columns.items()))))
+                continue
+            columns[name] = [missing if v is None else v for v in values]
+            groups.append((first, columns))
+
+        # Order attributes as a row-by-row build would: by the first product
+        #  with a value, then by attribute order, each attribute's flattened
+        #  columns taking its place
+        groups.sort(key=lambda group: group[0])
+        return {k: v for _, columns in groups for k, v in columns.items()}
+
+    @staticmethod
+    def _add_dict_columns(columns, values, missing, prefix=''):
+        """Add a column per key of a list of dicts (or None) to columns."""
+        keys = {}
+        for d in values:
+            if d is not None:
+                keys.update(dict.fromkeys(d))
+        for k in keys:
+            # Later keys overwrite earlier ones, as with dict.update in to_dict
+            columns[prefix + k] = [missing if d is None or d.get(k) is None else d[k] for d in values]
+
+    def _attr_names(self):
+        """All attribute names of the products, in schema then first seen order."""
+        names = dict.fromkeys(AmzProduct._all_attrs)
+        for prod in self._products:
+            if prod._extra_attrs is not None:
+                names.update(dict.fromkeys(prod._extra_attrs))
+        return list(names)
+
+    def _column(self, key, default=None):
+        """The values of one attribute, one per product (default where unavailable)."""
+        return [getattr(prod, key, default) for prod in self._products]
@@ -0,0 +1,354 @@
+"""
+AmzStore class for keeping crawled products in a local SQLite database.
+"""
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+
+try:
+    from amzsear.core import product_values
+    from amzsear.core.consts import DEFAULT_REGION
+    from amzsear.core.AmzProduct import AmzProduct
+    from amzsear.core.AmzProductDetails import AmzProductDetails
+    from amzsear.core.AmzReviews import AmzReview
+except ImportError:
+    from . import product_values
+    from .consts import DEFAULT_REGION
+    from .AmzProduct import AmzProduct
+    from .AmzProductDetails import AmzProductDetails
+    from .AmzReviews import AmzReview
+
+
+_SCHEMA = (
+    'CREATE TABLE IF NOT EXISTS products ('
+    'region TEXT NOT NULL, asin TEXT NOT NULL, title TEXT, product_url TEXT, image_url TEXT, '
+    'price REAL, rating REAL, rating_count INTEGER, ratings_text TEXT, ratings_count_text TEXT, '
+    'prices TEXT, extra_attributes TEXT, subtext TEXT, '
+    'first_seen REAL NOT NULL, last_seen REAL NOT NULL, PRIMARY KEY (region, asin))',
+    'CREATE INDEX IF NOT EXISTS products_asin ON products (asin)',
+    'CREATE INDEX IF NOT EXISTS products_price ON products (price)',
+    'CREATE INDEX IF NOT EXISTS products_rating ON products (rating)',
+
+    'CREATE TABLE IF NOT EXISTS observations ('
+    'region TEXT NOT NULL, asin TEXT NOT NULL, observed_at REAL NOT NULL, '
+    'price REAL, rating REAL, rating_count INTEGER)',
+    'CREATE INDEX IF NOT EXISTS observations_asin ON observations (asin, region, observed_at)',
+
+    'CREATE TABLE IF NOT EXISTS details ('
+    'region TEXT NOT NULL, asin TEXT NOT NULL, full_title TEXT, brand TEXT, brand_url TEXT, '
+    'about_items TEXT, technical_details TEXT, product_description TEXT, image_urls TEXT, '
+    'reviews_summary TEXT, star_distribution TEXT, review_count INTEGER, average_rating REAL, '
+    'fetched_at REAL NOT NULL, PRIMARY KEY (region, asin))',
+
+    'CREATE TABLE IF NOT EXISTS reviews ('
+    'region TEXT NOT NULL, asin TEXT NOT NULL, review_id TEXT NOT NULL, reviewer TEXT, rating REAL, '
+    'title TEXT, date TEXT, text TEXT, verified INTEGER, helpful_count INTEGER, images TEXT, '
+    'fetched_at REAL NOT NULL, PRIMARY KEY (region, asin, review_id))',
+    'CREATE INDEX IF NOT EXISTS reviews_rating ON reviews (asin, rating)',
+)
+
+_PRODUCT_COLUMNS = (
+    'region', 'asin', 'title', 'product_url', 'image_url', 'price', 'rating', 'rating_count',
+    'ratings_text', 'ratings_count_text', 'prices', 'extra_attributes', 'subtext',
+    'first_seen', 'last_seen',
+)
+_DETAILS_COLUMNS = ('region', 'asin') + tuple(AmzProductDetails._all_attrs) + ('fetched_at',)
+_REVIEW_COLUMNS = ('region', 'asin') + tuple(AmzReview._all_attrs) + ('fetched_at',)
+
+# Columns holding lists/dicts, stored as JSON text
+_JSON_COLUMNS = {
+    'prices', 'extra_attributes', 'subtext', 'about_items', 'technical_details',
+    'image_urls', 'star_distribution', 'images',
+}
+
+
+# The products columns filled from each search result field that may be
+#  left unextracted (see AmzProduct fields)
+_FIELD_COLUMNS = {
+    'image_url': ('image_url',),
+    'rating': ('rating', 'rating_count', 'ratings_text', 'ratings_count_text'),
+    'prices': ('price', 'prices'),
+    'extra_attributes': ('extra_attributes',),
+    'subtext': ('subtext',),
+}
+
+
+def _upsert_sql(table, columns, key, keep=(), partial=()):
+    """
+    Build an INSERT ... ON CONFLICT DO UPDATE statement.
+
+    Stored values are overwritten with the new row's, NULLs included, so a
+    value no longer found is cleared. Columns in keep are never updated, and
+    columns in partial (those of fields that were not extracted) keep the
+    stored value unless the new row has one.
+    """
+    updates = ', '.join(
+        f'{c} = COALESCE(excluded.{c}, {table}.{c})' if c in partial else f'{c} = excluded.{c}'
+        for c in columns if c not in key and c not in keep)
+    return (f'INSERT INTO {table} ({", ".join(columns)}) VALUES ({", ".join("?" * len(columns))}) '
+        f'ON CONFLICT ({", ".join(key)}) DO UPDATE SET {updates}')
+
+
+def _products_sql(unextracted=frozenset()):
+    """The products upsert for rows whose unextracted fields are given."""
+    sql = _PRODUCTS_SQL.get(unextracted)
+    if sql is None:
+        partial = {c for field in unextracted for c in _FIELD_COLUMNS[field]}
+        sql = _PRODUCTS_SQL[unextracted] = _upsert_sql(
+            'products', _PRODUCT_COLUMNS, ('region', 'asin'), keep=('first_seen',), partial=partial)
+    return sql
+
+
+_PRODUCTS_SQL = {}
+_DETAILS_SQL = _upsert_sql('details', _DETAILS_COLUMNS, ('region', 'asin'))
+_REVIEWS_SQL = _upsert_sql('reviews', _REVIEW_COLUMNS, ('region', 'asin', 'review_id'))
+_OBSERVATIONS_SQL = ('INSERT INTO observations (region, asin, observed_at, price, rating, rating_count) '
+    'VALUES (?, ?, ?, ?, ?, ?)')
+
+
+class AmzStore(object):
+    """
+    A local database of crawled products, stored in SQLite.
+
+    Products are stored once per region and ASIN, with their search result
+    fields and their parsed price, rating and rating count (indexed, along
+    with the ASIN, for fast queries). Each upsert also adds an observation
+    of the price and rating, so the history of a product is kept. Product
+    details and reviews, where fetched, are stored in their own tables.
+
+    A stored value no longer found when a product is upserted again (e.g. a
+    price that was removed) is cleared, except for the fields of products
+    searched without them (see AmzProduct fields), which keep their stored
+    values.
+
+        >>> store = AmzStore('amzsear_store.db')
+        >>> store.upsert(AmzSear.iter_products('Harry Potter', page=range(1, 21)))
+        >>> store.find(region='US', max_price=10, min_rating=4.5, order_by='price')
+
+    Upserts are written batch_size products per transaction, and the store is
+    safe to share between threads. The tables (products, observations,
+    details and reviews) can also be queried directly with query.
+
+    Args:
+        path (str): The SQLite database file (':memory:' for a store that only
+            lasts as long as the object).
+        batch_size (int): The number of products written per transaction.
+    """
+
+    def __init__(self, path='amzsear_store.db', batch_size=500):
+        self.batch_size = batch_size
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute('PRAGMA journal_mode = WAL')
+        self._conn.execute('PRAGMA synchronous = NORMAL')
+        for statement in _SCHEMA:
+            self._conn.execute(statement)
+        self._conn.commit()
+
+    def __len__(self):
+        with self._lock:
+            return self._conn.execute('SELECT COUNT(*) FROM products').fetchone()[0]
+
+    def upsert(self, products, observed_at=None):
+        """
+        Insert or update products, with their details and reviews if fetched.
+
+        Products are consumed lazily, so a generator (e.g. from
+        AmzSear.iter_products) is written as it is crawled.
+
+        Args:
+            products (AmzProduct, AmzSear or iterable): The product(s) to store.
+            observed_at (float): The time of the observation as a Unix
+                timestamp (defaults to now).
+
+        Returns:
+            int: The number of products stored.
+        """
+        if isinstance(products, AmzProduct):
+            products = [products]
+        elif hasattr(products, 'values'):
+            products = products.values()
+        if observed_at is None:
+            observed_at = time.time()
+
+        count = 0
+        batch = []
+        for product in products:
+            if not product._index:
+                continue
+            batch.append(product)
+            if len(batch) >= self.batch_size:
+                count += self._write(batch, observed_at)
+                batch = []
+        if batch:
+            count += self._write(batch, observed_at)
+        return count
+
+    def _write(self, products, observed_at):
+        """Write a batch of products in one transaction."""
+        product_rows, observation_rows, details_rows, review_rows = {}, [], [], []
+        for product in products:
+            region = product._region.upper()
+            unextracted = frozenset(f for f in _FIELD_COLUMNS if not product._is_extracted(f))
+            values = product_values(product)
+            rating = product.rating if product.rating is not None and product.rating.is_valid() else None
+            product_rows.setdefault(unextracted, []).append((
+                region, product._index, product.title, product.product_url, product.image_url,
+                values['price'], values['rating'], values['rating_count'],
+                rating.ratings_text if rating else None, rating.ratings_count_text if rating else None,
+                self._to_json(product.prices), self._to_json(product.extra_attributes),
+                self._to_json(product.subtext), observed_at, observed_at,
+            ))
+            observation_rows.append(
+                (region, product._index, observed_at, values['price'], values['rating'], values['rating_count']))
+
+            if product.details is not None and product.details.is_valid():
+                details_rows.append((region, product._index)
+                    + self._to_row(product.details, AmzProductDetails._all_attrs) + (observed_at,))
+            if product.reviews is not None:
+                for review in product.reviews.reviews or []:
+                    row = self._to_row(review, AmzReview._all_attrs)
+                    review_id = review.review_id or self._review_id(review)
+                    review_rows.append((region, product._index, review_id) + row[1:] + (observed_at,))
+
+        with self._lock:
+            with self._conn:
+                for unextracted, rows in product_rows.items():
+                    self._conn.executemany(_products_sql(unextracted), rows)
+                self._conn.executemany(_OBSERVATIONS_SQL, observation_rows)
+                if details_rows:
+                    self._conn.executemany(_DETAILS_SQL, details_rows)
+                if review_rows:
+                    self._conn.executemany(_REVIEWS_SQL, review_rows)
+        return len(observation_rows)
+
+    def get(self, asin, region=DEFAULT_REGION):
+        """
+        Get a stored product.
+
+        Args:
+            asin (str): The ASIN of the product.
+            region (str): The Amazon region of the product.
+
+        Returns:
+            dict: The product's row, with its details row (or None) under
+                'details', or None if the product is not stored.
+        """
+        key = (region.upper(), str(asin))
+        rows = self.query('SELECT * FROM products WHERE region = ? AND asin = ?', key)
+        if not rows:
+            return None
+        details = self.query('SELECT * FROM details WHERE region = ? AND asin = ?', key)
+        rows[0]['details'] = details[0] if details else None
+        return rows[0]
+
+    def find(self, region=None, asin=None, min_price=None, max_price=None, min_rating=None,
+            order_by=None, descending=False, limit=None):
+        """
+        Find stored products, using the indexes on region, ASIN, price and rating.
+
+        Args:
+            region (str): Only products from this region.
+            asin (str): Only products with this ASIN (in any region, unless
+                region is given).
+            min_price (float): Only products with a price of at least this.
+            max_price (float): Only products with a price of at most this.
+            min_rating (float): Only products rated at least this many stars.
+            order_by (str): A products column to sort by (e.g. 'price').
+            descending (bool): If True, sort in descending order.
+            limit (int): The maximum number of products returned.
+
+        Returns:
+            list: The matching product rows as dicts.
+
+        Raises:
+            ValueError: If order_by is not a products column.
+        """
+        conditions, params = [], []
+        for column, op, value in (
+                ('region', '=', region.upper() if region is not None else None),
+                ('asin', '=', asin),
+                ('price', '>=', min_price),
+                ('price', '<=', max_price),
+                ('rating', '>=', min_rating)):
+            if value is not None:
+                conditions.append(f'{column} {op} ?')
+                params.append(value)
+
+        sql = 'SELECT * FROM products'
+        if conditions:
+            sql += ' WHERE ' + ' AND '.join(conditions)
+        if order_by is not None:
+            if order_by not in _PRODUCT_COLUMNS:
+                raise ValueError(f'{repr(order_by)} is not one of {list(_PRODUCT_COLUMNS)}')
+            sql += f' ORDER BY {order_by} {"DESC" if descending else "ASC"}'
+        if limit is not None:
+            sql += ' LIMIT ?'
+            params.append(limit)
+        return self.query(sql, params)
+
+    def history(self, asin, region=DEFAULT_REGION):
+        """
+        Get the observations of a product's price and rating over time.
+
+        Args:
+            asin (str): The ASIN of the product.
+            region (str): The Amazon region of the product.
+
+        Returns:
+            list: The observation rows as dicts, oldest first.
+        """
+        return self.query(
+            'SELECT * FROM observations WHERE asin = ? AND region = ? ORDER BY observed_at',
+            (str(asin), region.upper()))
+
+    def query(self, sql, params=()):
+        """
+        Run a query against the store.
+
+        JSON columns (e.g. prices) are decoded back to lists and dicts, with
+        the star ratings keying star_distribution back to ints.
+
+        Args:
+            sql (str): The SQL query.
+            params (sequence or dict): The query's parameters.
+
+        Returns:
+            list: The result rows as dicts.
+        """
+        with self._lock:
+            cursor = self._conn.execute(sql, params)
+            rows = cursor.fetchall()
+        columns = [c[0] for c in cursor.description or []]
+        decode = [c in _JSON_COLUMNS for c in columns]
+        rows = [{c: json.loads(v) if d and v is not None else v for c, d, v in zip(columns, decode, row)}
+            for row in rows]
+        if 'star_distribution' in columns:
+            for row in rows:
+                if row['star_distribution'] is not None:
+                    row['star_distribution'] = {int(k): v for k, v in row['star_distribution'].items()}
+        return rows
+
+    def close(self):
+        """Close the underlying database connection."""
+        with self._lock:
+            self._conn.close()
+
+    @staticmethod
+    def _to_json(value):
+        """Encode a list or dict for a JSON column (None stays NULL)."""
+        return json.dumps(value, ensure_ascii=False) if value is not None else None
+
+    @classmethod
+    def _to_row(cls, obj, attrs):
+        """Convert an AmzBase object to a row tuple of its attributes."""
+        return tuple(cls._to_json(v) if k in _JSON_COLUMNS else v for k, v in ((k, obj.get(k)) for k in attrs))
+
+    @staticmethod
+    def _review_id(review):
+        """An id for a review without one, from the fields identifying it."""
+        data = json.dumps(review._dedup_key(), ensure_ascii=False).encode('utf-8')
+        return hashlib.blake2b(data, digest_size=8).hexdigest()
@@ -0,0 +1,67 @@
+import asyncio
+from functools import partial
+
+try:
+    from amzsear.core import build_url, get_iter, fetch_content_async, new_async_session
+    from amzsear.core.consts import DEFAULT_REGION
+    from amzsear.core.AmzSear import AmzSear
+except ImportError:
+    from . import build_url, get_iter, fetch_content_async, new_async_session
+    from .consts import DEFAULT_REGION
+    from .AmzSear import AmzSear
+
+
+class AsyncAmzSear(AmzSear):
+    """
+    The AsyncAmzSear class extends AmzSear with pages fetched on an asyncio
+    event loop instead of blocking the calling thread.
+
+    Searches should be created with the create coroutine, which fetches all
+    pages concurrently and then parses them with the same code as AmzSear,
+    in the event loop's default executor so other tasks keep running.
+    The constructor itself behaves exactly like the AmzSear constructor.
+
+    aiohttp must be installed to fetch pages asynchronously.
+
+    Example:
+        >>> amz = await AsyncAmzSear.create('Harry Potter', page=range(1, 4))
+        >>> await amz.rget(0).fetch_details_async()
+    """
+
+    @classmethod
+    async def create(cls, query=None, page=1, region=DEFAULT_REGION, url=None, session=None,
+            fields=None, lazy=False):
+        """
+        Fetch and parse a search without blocking the event loop.
+
+        Args:
+            query (str): A search query to look up on Amazon.
+            page (int or iterable): The page number(s) of the query (defaults to 1).
+            region (str): The Amazon region/country to search (defaults to US).
+            url (str or iterable): An Amazon search url (not recommended).
+            session (aiohttp.ClientSession): A session to fetch pages with
+                (a temporary session is used if not given).
+            fields (iterable): Only extract these AmzProduct fields (see AmzSear).
+            lazy (bool): If True, extract product fields on first access (see AmzSear).
+
+        Returns:
+            AsyncAmzSear: The parsed search results, in page order.
+        """
+        if query is not None:
+            url = [build_url(query=query, page_num=p, region=region) for p in get_iter(page)]
+        if url is None:
+            return cls(region=region)
+        url = list(get_iter(url))
+
+        if session is None:
+            async with new_async_session() as temp_session:
+                return await cls.create(url=url, region=region, session=temp_session,
+                    fields=fields, lazy=lazy)
+
+        html = await asyncio.gather(
+            *[fetch_content_async(build_url(u), session=session) for u in url])
+        # Parsing is CPU bound, so it is kept off the event loop
+        loop = asyncio.get_running_loop()
+        amz = await loop.run_in_executor(None, partial(cls, html=html, region=region, fields=fields, lazy=lazy))
+        amz._urls = url
+        return amz
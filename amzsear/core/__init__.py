@@ -1,15 +1,23 @@
+import asyncio
+import json
+import re
+import threading
+import time
 from functools import wraps
 from urllib import parse
 
 import requests
-from lxml import html as html_module
+from requests.adapters import HTTPAdapter
+from lxml import etree, html as html_module
 
 try:
     from amzsear.core.consts import (QUERY_BUILD_DICT, BASE_URL, DEFAULT_REGION,
-        REGION_CODES, SEARCH_URL, REQUEST_HEADERS)
+        REGION_CODES, SEARCH_URL, REQUEST_HEADERS, REQUEST_TIMEOUT, POOL_SIZE, PARSE_CHUNK_SIZE, DECIMAL_COMMA_REGIONS)
 except ImportError:
     from .consts import (QUERY_BUILD_DICT, BASE_URL, DEFAULT_REGION,
-        REGION_CODES, SEARCH_URL, REQUEST_HEADERS)
+        REGION_CODES, SEARCH_URL, REQUEST_HEADERS, REQUEST_TIMEOUT, POOL_SIZE, PARSE_CHUNK_SIZE, DECIMAL_COMMA_REGIONS)
+
+_NUMBER_RE = re.compile(r'\d[\d.,]*')
 
 
 def requires_valid_data(default=None):
@@ -38,6 +46,14 @@ def capture_exception(error, default=None):
     return decorator
 
 
+def get_iter(it):
+    """Wrap a single (non-iterable, str or bytes) argument in a list."""
+    if not hasattr(it, '__iter__') or isinstance(it, (str, bytes)):
+        return [it]
+    else:
+        return it
+
+
 def build_url(url=None, query='', page_num=1, region=DEFAULT_REGION):
     """Build a URL based on a query."""
     if url is None:
@@ -67,17 +83,527 @@ def build_base_url(region=DEFAULT_REGION):
     return BASE_URL + REGION_CODES[find_region]
 
 
+def parse_numbers(text, region=DEFAULT_REGION):
+    """
+    Extract the numbers from some text, using the region's decimal separator.
+
+    A single separator not followed by exactly three digits is always read
+    as a decimal point (e.g. '4.5' or '4,5'); otherwise the region decides.
+
+    Example: parse_numbers('1.234,56 €', 'DE') == [1234.56]
+
+    Args:
+        text (str): The text to extract from (e.g. a price or rating).
+        region (str): The Amazon region the text comes from.
+
+    Returns:
+        list: List of floats for any numbers in the text.
+    """
+    if not text:
+        return []
+    if region.upper() in DECIMAL_COMMA_REGIONS:
+        thousands, decimal = '.', ','
+    else:
+        thousands, decimal = ',', '.'
+    numbers = []
+    for x in _NUMBER_RE.findall(text):
+        x = x.rstrip('.,')
+        last = max(x.rfind('.'), x.rfind(','))
+        if last >= 0 and len(x) - last - 1 != 3 and x.count(x[last]) == 1:
+            x = x[:last].replace('.', '').replace(',', '') + '.' + x[last + 1:]
+        else:
+            x = x.replace(thousands, '').replace(decimal, '.')
+        numbers.append(float(x))
+    return numbers
+
+
+def product_values(product):
+    """
+    Get the numeric values of a search result, parsed for its region.
+
+    Args:
+        product (AmzProduct): The product.
+
+    Returns:
+        dict: The product's lowest price, rating (stars) and rating_count,
+            each None if not found.
+    """
+    prices = []
+    for text in (product.prices or {}).values():
+        prices += parse_numbers(text, product._region)
+
+    stars, count = None, None
+    rating = product.rating
+    if rating is not None and rating.is_valid():
+        stars = parse_numbers(rating.ratings_text, product._region)
+        count = parse_numbers(rating.ratings_count_text, product._region)
+        stars = stars[0] if stars else None
+        count = int(count[0]) if count else None
+
+    return {'price': min(prices) if prices else None, 'rating': stars, 'rating_count': count}
+
+
+# The JSON encoder used by dumps, picked on first use
+_json_dumps = None
+
+
+def _get_json_dumps():
+    """Get a dumps(obj, pretty) function, using orjson if it is installed."""
+    global _json_dumps
+    if _json_dumps is None:
+        try:
+            import orjson
+        except ImportError:
+            def _json_dumps(obj, pretty):
+                return json.dumps(obj, indent=2 if pretty else None)
+        else:
+            def _json_dumps(obj, pretty):
+                option = orjson.OPT_NON_STR_KEYS | (orjson.OPT_INDENT_2 if pretty else 0)
+                return orjson.dumps(obj, option=option).decode('utf-8')
+    return _json_dumps
+
+
+def dumps(obj, pretty=False):
+    """
+    Encode an object as JSON, with orjson if it is installed.
+
+    orjson is several times faster than the json module on large results.
+    Without it, the output is that of json.dumps (non-ASCII characters
+    escaped). orjson writes non-ASCII characters as UTF-8 instead and puts
+    no spaces after separators on one line, so the text differs but decodes
+    to the same values. Non-string dict keys (e.g. star_distribution's) are
+    converted to strings by both.
+
+    Args:
+        obj: The object to encode (dicts, lists, strings, numbers, bools and None).
+        pretty (bool): If True, indent the output by 2 spaces.
+
+    Returns:
+        str: The JSON text.
+    """
+    return _get_json_dumps()(obj, pretty)
+
+
 class FetchError(Exception):
     """Raised when fetching a URL fails."""
     pass
 
 
-def fetch_html(url):
+# Connection pooling - one requests.Session per Amazon host, shared by
+# AmzSear, AmzProduct.fetch_details and the CLI unless a session is injected.
+_session_lock = threading.Lock()
+_sessions = {}
+_shared_session = None
+_pool_size = POOL_SIZE
+_cache = None
+_memo = None
+_rate_limiter = None
+
+
+def new_session(pool_size=None):
+    """
+    Create a keep-alive session, like the managed per-host sessions.
+
+    Args:
+        pool_size (int): The maximum number of keep-alive connections kept
+            (defaults to the size set with set_session, or POOL_SIZE).
+
+    Returns:
+        requests.Session: A new session, for the caller to close.
+    """
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size or _pool_size)
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    return session
+
+
+def get_session(url):
+    """
+    Get the pooled session used to fetch a URL.
+
+    Sessions are created lazily, one per host (e.g. www.amazon.co.uk), and
+    reused across threads. If a session has been injected with set_session,
+    that session is returned for every host instead.
+
+    Args:
+        url (str): The URL about to be fetched.
+
+    Returns:
+        requests.Session: The session to use for the URL's host.
+    """
+    if _shared_session is not None:
+        return _shared_session
+
+    host = parse.urlparse(url).netloc
+    with _session_lock:
+        session = _sessions.get(host)
+        if session is None:
+            session = _sessions[host] = new_session(_pool_size)
+        return session
+
+
+def set_session(session=None, pool_size=None):
+    """
+    Inject a session or reconfigure the managed per-host connection pools.
+
+    Any previously managed sessions are closed; an injected session is left
+    for the caller to close. Passing only pool_size resizes the managed
+    pools and keeps an injected session as it is: its pools (like its
+    adapters, proxies and auth) are for the caller to size, e.g. by creating
+    it with new_session. set_session() with no arguments goes back to the
+    managed sessions.
+
+    Args:
+        session (requests.Session): A session to use for all requests.
+        pool_size (int): The maximum number of keep-alive connections kept
+            per host by the managed sessions (defaults to POOL_SIZE).
+    """
+    global _shared_session, _pool_size
+    with _session_lock:
+        for managed in _sessions.values():
+            managed.close()
+        _sessions.clear()
+        if pool_size is not None:
+            _pool_size = pool_size
+            if session is None:
+                return
+        _shared_session = session
+
+
+def set_cache(cache=None):
+    """
+    Enable or disable the response cache used by all fetches.
+
+    Args:
+        cache (AmzCache): The cache to read pages from and store them in, or
+            None to disable caching (the default).
+    """
+    global _cache
+    _cache = cache
+
+
+def get_cache():
+    """Get the response cache set with set_cache, or None if disabled."""
+    return _cache
+
+
+def set_memo(memo=None):
+    """
+    Enable or disable memoization of parsed pages by content hash.
+
+    Args:
+        memo (AmzMemo): The memo to look parsed pages up in and store them
+            in, or None to disable memoization (the default).
+    """
+    global _memo
+    _memo = memo
+
+
+def get_memo():
+    """Get the parse memo set with set_memo, or None if disabled."""
+    return _memo
+
+
+def set_rate_limiter(limiter=None):
+    """
+    Enable or disable rate limiting and retries for all fetches.
+
+    Args:
+        limiter (AmzRateLimiter): The limiter to pace requests with and to
+            decide on retries, or None to make a single attempt per fetch
+            without any limit (the default).
+    """
+    global _rate_limiter
+    _rate_limiter = limiter
+
+
+def get_rate_limiter():
+    """Get the rate limiter set with set_rate_limiter, or None if disabled."""
+    return _rate_limiter
+
+
+def parse_content(content, parser, *args, raw=False):
+    """
+    Parse raw page content, reusing an earlier result for identical content.
+
+    The content is parsed into an lxml tree and passed to parser along with
+    args. If a memo is set (see set_memo), the result is memoized under a
+    hash of the content so identical pages are only parsed once.
+
+    Args:
+        content (bytes or str): The raw HTML of a page.
+        parser (callable): Called as parser(html_element, *args).
+        args: Extra arguments for parser, also part of the memo key.
+        raw (bool): If True, parser is called with the content itself rather
+            than a tree (for parsers that stream the page, see iter_subtrees).
+
+    Returns:
+        The parser's result.
+    """
+    memo = _memo
+    if memo is None:
+        return parser(content if raw else html_module.fromstring(content), *args)
+    return memo.parse(content, parser, *args, raw=raw)
+
+
+def iter_subtrees(content, match, tag=None, chunk_size=PARSE_CHUNK_SIZE):
+    """
+    Incrementally parse an HTML page, only keeping the subtrees of interest.
+
+    The page is fed to the parser chunk_size at a time. Each element matching
+    match (tested as it starts, so on its tag and attributes) is yielded once
+    complete, with all its descendants. Every other element is cleared as
+    soon as it ends, so the rest of the page (navigation, scripts, footer)
+    is never held in full, and a yielded subtree does not keep the page
+    alive once it is dropped from the tree.
+
+    Args:
+        content (bytes or str): The raw HTML of a page.
+        match (callable): Called with each element, truthy if the element
+            starts a subtree (e.g. an XPath from compile_self_selector).
+        tag (str): If given, only elements with this tag are tested and
+            cleared as they end (much faster, as lxml skips the events of
+            other elements; they are still dropped with their parents or
+            siblings).
+        chunk_size (int): The number of bytes (or characters) fed at a time.
+
+    Yields:
+        lxml.html.HtmlElement: Each outermost matching element, in page order.
+    """
+    parser = etree.HTMLPullParser(events=('start', 'end'), tag=tag)
+    # HtmlElement for every tag (a C level lookup, unlike lxml.html's own)
+    parser.set_element_class_lookup(etree.ElementDefaultClassLookup(element=html_module.HtmlElement))
+    subtree = None
+
+    def read_events():
+        nonlocal subtree
+        for event, elem in parser.read_events():
+            if event == 'start':
+                if subtree is None and match(elem):
+                    subtree = elem
+            elif elem is subtree:
+                subtree = None
+                yield elem
+            elif subtree is None:
+                # Drop the finished element's children, and finished siblings
+                #  before it (including yielded subtrees), from the tree
+                elem.clear(keep_tail=True)
+                parent = elem.getparent()
+                if parent is not None:
+                    while elem.getprevious() is not None:
+                        del parent[0]
+
+    for start in range(0, len(content), chunk_size):
+        parser.feed(content[start:start + chunk_size])
+        yield from read_events()
+    parser.close()
+    yield from read_events()
+
+
+def fetch_content(url, session=None):
+    """
+    Fetch the raw content of a URL, going through the response cache if set.
+
+    If a rate limiter is set (see set_rate_limiter), the request waits for
+    its turn and failed requests are retried as the limiter decides.
+
+    Args:
+        url: The URL to fetch
+        session: A requests.Session to fetch with (defaults to the pooled
+            session for the URL's host, see get_session)
+
+    Returns:
+        bytes: The response body
+
+    Raises:
+        FetchError: If the fetch fails (network error, 404, etc.)
+    """
+    cache = _cache
+    if cache is not None:
+        content = cache.get(url)
+        if content is not None:
+            return content
+
+    content = _request(url, session=session).content
+    if cache is not None:
+        cache.set(url, content)
+    return content
+
+
+def fetch_content_conditional(url, etag=None, last_modified=None, session=None):
+    """
+    Fetch a URL only if it changed since an earlier response.
+
+    The ETag and Last-Modified of the earlier response are sent as
+    If-None-Match and If-Modified-Since, and the server can answer 304 Not
+    Modified instead of sending the page again. The response cache is not
+    used, but the rate limiter is (see fetch_content).
+
+    Args:
+        url: The URL to fetch
+        etag: The ETag header of the earlier response
+        last_modified: The Last-Modified header of the earlier response
+        session: A requests.Session to fetch with (defaults to the pooled
+            session for the URL's host, see get_session)
+
+    Returns:
+        tuple: (content, etag, last_modified) of the response, content being
+            None if the page was not modified.
+
+    Raises:
+        FetchError: If the fetch fails (network error, 404, etc.)
+    """
+    headers = {}
+    if etag:
+        headers['If-None-Match'] = etag
+    if last_modified:
+        headers['If-Modified-Since'] = last_modified
+    response = _request(url, session=session, headers=headers)
+    etag = response.headers.get('ETag', etag)
+    last_modified = response.headers.get('Last-Modified', last_modified)
+    if response.status_code == 304:
+        return (None, etag, last_modified)
+    return (response.content, etag, last_modified)
+
+
+def _request(url, session=None, headers=None):
+    """Make a GET request through the rate limiter (if set), returning the response."""
+    if session is None:
+        session = get_session(url)
+    if headers:
+        headers = {**REQUEST_HEADERS, **headers}
+    else:
+        headers = REQUEST_HEADERS
+    limiter = _rate_limiter
+    attempt = 0
+    while True:
+        if limiter is not None:
+            limiter.acquire(url)
+        try:
+            response = session.get(url, headers=headers, timeout=REQUEST_TIMEOUT)
+            response.raise_for_status()
+            break
+        except (requests.ConnectionError, requests.Timeout, requests.HTTPError) as e:
+            delay = None
+            if limiter is not None:
+                failed = e.response
+                delay = limiter.retry_delay(url, attempt,
+                    status=failed.status_code if failed is not None else None,
+                    retry_after=failed.headers.get('Retry-After') if failed is not None else None)
+            if delay is None:
+                raise FetchError(f"Failed to fetch {url}: {e}") from e
+        except requests.RequestException as e:
+            # Not transient (e.g. an invalid URL or header), so never retried
+            raise FetchError(f"Failed to fetch {url}: {e}") from e
+        time.sleep(delay)
+        attempt += 1
+
+    if limiter is not None:
+        limiter.success(url)
+    return response
+
+
+def fetch_html(url, session=None):
     """
     Fetch HTML content from a URL and return parsed lxml element.
 
     Args:
         url: The URL to fetch
+        session: A requests.Session to fetch with (defaults to the pooled
+            session for the URL's host, see get_session)
+
+    Returns:
+        lxml HTML element
+
+    Raises:
+        FetchError: If the fetch fails (network error, 404, etc.)
+    """
+    return html_module.fromstring(fetch_content(url, session=session))
+
+
+async def fetch_content_async(url, session=None):
+    """
+    Fetch the raw content of a URL without blocking the event loop.
+
+    The asynchronous counterpart of fetch_content, also going through the
+    rate limiter if set. aiohttp must be installed for this function to be
+    called.
+
+    Args:
+        url: The URL to fetch
+        session: An aiohttp.ClientSession to fetch with (a temporary session
+            is opened and closed if not given)
+
+    Returns:
+        bytes: The response body
+
+    Raises:
+        FetchError: If the fetch fails (network error, 404, etc.)
+    """
+    cache = _cache
+    if cache is not None:
+        content = cache.get(url)
+        if content is not None:
+            return content
+
+    if session is None:
+        async with new_async_session() as temp_session:
+            content = await _request_async(url, temp_session)
+    else:
+        content = await _request_async(url, session)
+
+    if cache is not None:
+        cache.set(url, content)
+    return content
+
+
+async def _request_async(url, session):
+    """Make a GET request through the rate limiter (if set), returning the body."""
+    # Only import at this point as amzSear can be used without aiohttp if desired
+    import aiohttp
+
+    limiter = _rate_limiter
+    attempt = 0
+    while True:
+        if limiter is not None:
+            await limiter.acquire_async(url)
+        try:
+            async with session.get(url, headers=REQUEST_HEADERS) as response:
+                response.raise_for_status()
+                content = await response.read()
+            break
+        except (aiohttp.ClientConnectionError, aiohttp.ClientResponseError, asyncio.TimeoutError) as e:
+            delay = None
+            if limiter is not None:
+                if isinstance(e, aiohttp.ClientResponseError):
+                    delay = limiter.retry_delay(url, attempt, status=e.status,
+                        retry_after=e.headers.get('Retry-After') if e.headers else None)
+                else:
+                    delay = limiter.retry_delay(url, attempt)
+            if delay is None:
+                raise FetchError(f"Failed to fetch {url}: {e}") from e
+        except aiohttp.ClientError as e:
+            raise FetchError(f"Failed to fetch {url}: {e}") from e
+        await asyncio.sleep(delay)
+        attempt += 1
+
+    if limiter is not None:
+        limiter.success(url)
+    return content
+
+
+async def fetch_html_async(url, session=None):
+    """
+    Fetch HTML content from a URL without blocking the event loop.
+
+    The asynchronous counterpart of fetch_html. aiohttp must be installed
+    for this function to be called.
+
+    Args:
+        url: The URL to fetch
+        session: An aiohttp.ClientSession to fetch with (a temporary session
+            is opened and closed if not given)
 
     Returns:
         lxml HTML element
@@ -85,9 +611,18 @@ def fetch_html(url):
     Raises:
         FetchError: If the fetch fails (network error, 404, etc.)
     """
-    try:
-        response = requests.get(url, headers=REQUEST_HEADERS, timeout=30)
-        response.raise_for_status()
-        return html_module.fromstring(response.content)
-    except requests.RequestException as e:
-        raise FetchError(f"Failed to fetch {url}: {e}") from e
+    return html_module.fromstring(await fetch_content_async(url, session=session))
+
+
+def new_async_session():
+    """
+    Create an aiohttp.ClientSession configured for Amazon requests.
+
+    The session should be shared between requests and closed by the caller,
+    ideally with "async with". aiohttp must be installed.
+
+    Returns:
+        aiohttp.ClientSession: A new keep-alive client session.
+    """
+    import aiohttp
+    return aiohttp.ClientSession(timeout=aiohttp.ClientTimeout(total=REQUEST_TIMEOUT))
@@ -23,6 +23,9 @@ REGION_CODES = {
 
 DEFAULT_REGION = "US"
 
+# Regions writing numbers as 1.234,56 rather than 1,234.56
+DECIMAL_COMMA_REGIONS = {'BR', 'DE', 'ES', 'FR', 'IT', 'NL'}
+
 #URL Building
 BASE_URL = 'https://www.amazon'
 QUERY_BUILD_DICT = {}
@@ -32,6 +35,7 @@ SEARCH_URL = '%s/s/ref=nb_sb_noss?sf=qz&keywords=%s&ie=UTF8&unfiltered=1&page=%s
 # Product detail page URLs
 PRODUCT_URL = '%s/dp/%s'  # BASE_URL + region, ASIN
 REVIEWS_URL = '%s/product-reviews/%s'  # BASE_URL + region, ASIN
+REVIEWS_PAGE_URL = '%s/product-reviews/%s?pageNumber=%s'  # BASE_URL + region, ASIN, page
 QA_URL = '%s/ask/questions/asin/%s'  # BASE_URL + region, ASIN
 
 # Request headers for all Amazon requests
@@ -42,3 +46,34 @@ REQUEST_HEADERS = {
     'Accept-Language': 'en-US,en;q=0.9',
     'Connection': 'keep-alive',
 }
+
+# Connection handling
+REQUEST_TIMEOUT = 30  # seconds
+POOL_SIZE = 10  # keep-alive connections per Amazon host
+PARSE_CHUNK_SIZE = 64 * 1024  # bytes fed to the streaming parser at a time
+
+# Response cache (see AmzCache) - time to live in seconds per page type
+CACHE_TTL = {
+    'search': 60 * 60,
+    'product': 6 * 60 * 60,
+    'reviews': 6 * 60 * 60,
+    'qa': 24 * 60 * 60,
+    'other': 60 * 60,
+}
+CACHE_MAX_SIZE = 256 * 1024 * 1024  # bytes
+# Pages containing any of these are robot checks (captcha forms), never cached
+ROBOT_CHECK_MARKERS = (b'validateCaptcha', b'captchacharacters')
+SEARCH_RESULT_MARKER = b'data-component-type="s-search-result"'
+
+# Rate limiting and retries (see AmzRateLimiter)
+RATE_LIMIT = 1.0  # requests per second per Amazon host
+RATE_BURST = 5  # requests allowed back to back before the rate applies
+MAX_RETRIES = 4
+BACKOFF_BASE = 1.0  # seconds, doubled after each failed attempt
+BACKOFF_MAX = 60.0  # seconds, also the longest Retry-After that is waited for
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+THROTTLE_STATUSES = {429, 503}
+ADAPTIVE_RATE_STEP = 0.25  # requests per second added after each success
+ADAPTIVE_RATE_FACTOR = 0.5  # rate multiplier when throttled
+ADAPTIVE_MIN_RATE = 0.1
+ADAPTIVE_MAX_RATE = 20.0
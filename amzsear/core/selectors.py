@@ -1,9 +1,16 @@
 """
 CSS selectors for parsing Amazon product pages.
 These selectors work with lxml/cssselect on raw HTML - no JS execution needed.
+
+Each selector is also compiled once at import time into an lxml XPath
+object (the *_XPATH names), which the parsers call directly instead of
+translating the CSS again on every .cssselect() call.
 """
 from enum import Enum
 
+from lxml import etree
+from lxml.cssselect import CSSSelector, LxmlHTMLTranslator
+
 
 class DetailLevel(Enum):
     """
@@ -16,6 +23,20 @@ class DetailLevel(Enum):
     FULL = 3        # + Q&A page (1 additional request)
 
 
+# Search page selectors
+SEARCH_RESULT_TAG = 'div'
+SEARCH_RESULT = SEARCH_RESULT_TAG + '[data-asin][data-component-type="s-search-result"]'
+RESULT_TITLE = 'h2'
+RESULT_LINK = 'a'
+RESULT_SUBTEXT_ROW = 'div[class="a-row a-spacing-none"]'
+RESULT_SUBTEXT = 'span[class*="a-size-small"]'
+RESULT_IMAGE = 'img[src]'
+RESULT_PRICE_NAME = 'h3[data-attribute]'
+RESULT_PRICE_TEXT = 'span[class^="a"]'
+RESULT_EXTRAS = 'div[class="a-fixed-left-grid-inner"] > div > span'
+RESULT_RATING_STARS = 'i[class*="star"]'
+RESULT_RATING_COUNT = 'a[href*="customerReviews"]'
+
 # Product detail page selectors
 PRODUCT_TITLE = '#productTitle'
 BRAND_LINK = '#bylineInfo'
@@ -28,6 +49,7 @@ TECH_DETAILS_TABLE = '#prodDetails table'
 TECH_DETAILS_ROWS = '#prodDetails table tr'
 PRODUCT_DETAILS_TABLE = '#productDetails_techSpec_section_1 tr'
 PRODUCT_DETAILS_TABLE_ALT = '#productDetails_detailBullets_sections1 tr'
+TABLE_CELLS = 'th, td'
 
 # Images
 IMAGE_GALLERY = '#altImages img'
@@ -51,8 +73,93 @@ REVIEW_AUTHOR = '.a-profile-name'
 REVIEW_VERIFIED = '[data-hook="avp-badge"]'
 REVIEW_HELPFUL = '[data-hook="helpful-vote-statement"]'
 REVIEW_IMAGES = '[data-hook="review-image-tile"]'
+REVIEW_FEATURE_BUTTONS = '[data-hook="cr-insights-widget-aspects"] button'
 
 # Q&A page selectors
-QA_QUESTION = '.a-fixed-left-grid'
-QA_QUESTION_TEXT = '.a-declarative'
-QA_ANSWER = '.a-spacing-base'
+QA_QUESTION = '.askTeaserQuestions > .a-fixed-left-grid'
+QA_QUESTION_TEXT = '.a-declarative[data-action="ask-no-op"]'
+QA_ROW = '.a-fixed-left-grid .a-fixed-left-grid'  # question and answer rows, label on the left
+QA_ROW_TEXT = '.a-col-right'
+QA_ANSWER_BYLINE = '.a-color-tertiary'
+
+
+def compile_selector(css):
+    """
+    Compile a CSS selector into a reusable lxml XPath object.
+
+    Calling the result with an element is equivalent to element.cssselect(css)
+    but skips the CSS to XPath translation.
+
+    Args:
+        css (str): The CSS selector.
+
+    Returns:
+        lxml.cssselect.CSSSelector: A callable returning the matching elements.
+    """
+    return CSSSelector(css, translator='html')
+
+
+def compile_self_selector(css):
+    """
+    Compile a CSS selector into an XPath object matching the element itself.
+
+    Unlike compile_selector, descendants are not searched, so the result can
+    test elements as they are parsed, before their children exist (only
+    selectors on the tag and attributes are meaningful then).
+
+    Args:
+        css (str): The CSS selector.
+
+    Returns:
+        lxml.etree.XPath: A callable returning [element] if it matches, else [].
+    """
+    return etree.XPath(LxmlHTMLTranslator().css_to_xpath(css, prefix='self::'))
+
+
+# Compiled selectors
+SEARCH_RESULT_XPATH = compile_selector(SEARCH_RESULT)
+SEARCH_RESULT_SELF_XPATH = compile_self_selector(SEARCH_RESULT)
+RESULT_TITLE_XPATH = compile_selector(RESULT_TITLE)
+RESULT_LINK_XPATH = compile_selector(RESULT_LINK)
+RESULT_SUBTEXT_ROW_XPATH = compile_selector(RESULT_SUBTEXT_ROW)
+RESULT_SUBTEXT_XPATH = compile_selector(RESULT_SUBTEXT)
+RESULT_IMAGE_XPATH = compile_selector(RESULT_IMAGE)
+RESULT_PRICE_NAME_XPATH = compile_selector(RESULT_PRICE_NAME)
+RESULT_PRICE_TEXT_XPATH = compile_selector(RESULT_PRICE_TEXT)
+RESULT_EXTRAS_XPATH = compile_selector(RESULT_EXTRAS)
+RESULT_RATING_STARS_XPATH = compile_selector(RESULT_RATING_STARS)
+RESULT_RATING_COUNT_XPATH = compile_selector(RESULT_RATING_COUNT)
+
+PRODUCT_TITLE_XPATH = compile_selector(PRODUCT_TITLE)
+BRAND_LINK_XPATH = compile_selector(BRAND_LINK)
+FEATURE_BULLETS_XPATH = compile_selector(FEATURE_BULLETS)
+PRODUCT_DESCRIPTION_XPATH = compile_selector(PRODUCT_DESCRIPTION)
+PRODUCT_DESCRIPTION_ALT_XPATH = compile_selector(PRODUCT_DESCRIPTION_ALT)
+TECH_DETAILS_ROWS_XPATH = compile_selector(TECH_DETAILS_ROWS)
+PRODUCT_DETAILS_TABLE_XPATH = compile_selector(PRODUCT_DETAILS_TABLE)
+PRODUCT_DETAILS_TABLE_ALT_XPATH = compile_selector(PRODUCT_DETAILS_TABLE_ALT)
+TABLE_CELLS_XPATH = compile_selector(TABLE_CELLS)
+IMAGE_GALLERY_XPATH = compile_selector(IMAGE_GALLERY)
+MAIN_IMAGE_XPATH = compile_selector(MAIN_IMAGE)
+IMAGE_THUMB_LIST_XPATH = compile_selector(IMAGE_THUMB_LIST)
+REVIEW_COUNT_XPATH = compile_selector(REVIEW_COUNT)
+RATING_STARS_XPATH = compile_selector(RATING_STARS)
+STAR_HISTOGRAM_XPATH = compile_selector(STAR_HISTOGRAM)
+CUSTOMER_REVIEWS_SUMMARY_XPATH = compile_selector(CUSTOMER_REVIEWS_SUMMARY)
+
+REVIEW_ITEM_XPATH = compile_selector(REVIEW_ITEM)
+REVIEW_TITLE_XPATH = compile_selector(REVIEW_TITLE)
+REVIEW_RATING_XPATH = compile_selector(REVIEW_RATING)
+REVIEW_DATE_XPATH = compile_selector(REVIEW_DATE)
+REVIEW_BODY_XPATH = compile_selector(REVIEW_BODY)
+REVIEW_AUTHOR_XPATH = compile_selector(REVIEW_AUTHOR)
+REVIEW_VERIFIED_XPATH = compile_selector(REVIEW_VERIFIED)
+REVIEW_HELPFUL_XPATH = compile_selector(REVIEW_HELPFUL)
+REVIEW_IMAGES_XPATH = compile_selector(REVIEW_IMAGES)
+REVIEW_FEATURE_BUTTONS_XPATH = compile_selector(REVIEW_FEATURE_BUTTONS)
+
+QA_QUESTION_XPATH = compile_selector(QA_QUESTION)
+QA_QUESTION_TEXT_XPATH = compile_selector(QA_QUESTION_TEXT)
+QA_ROW_XPATH = compile_selector(QA_ROW)
+QA_ROW_TEXT_XPATH = compile_selector(QA_ROW_TEXT)
+QA_ANSWER_BYLINE_XPATH = compile_selector(QA_ANSWER_BYLINE)
@@ -0,0 +1,146 @@
+"""
+Offline parser benchmarks using the synthetic pages in benchmarks/fixtures,
+modeled on live markup.
+
+Each parser is run repeatedly over the fixture page of every region and
+reports pages/sec, items/sec (products, ratings, reviews or questions parsed) and
+peak memory: the peak Python heap of a single parse (tracemalloc) and the
+growth in peak RSS of a fresh process running the benchmark, which also
+covers the memory lxml allocates outside of Python.
+
+    $ python benchmarks/run.py
+    $ python benchmarks/run.py --parsers search,reviews --regions us,de --seconds 2
+"""
+import argparse
+import multiprocessing
+import os
+import sys
+import time
+import tracemalloc
+
+try:
+    import resource
+except ImportError:  # not available on Windows
+    resource = None
+
+from lxml import html as html_module
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+FIXTURES_DIR = os.path.join(BENCH_DIR, 'fixtures')
+sys.path.insert(0, os.path.join(BENCH_DIR, '..'))
+
+from amzsear import AmzSear, AmzProductDetails, AmzReviews, AmzQuestions
+from amzsear.core.AmzRating import AmzRating
+from amzsear.core.selectors import SEARCH_RESULT_XPATH
+
+
+def parse_search(content, region):
+    """AmzSear from raw HTML - counts products."""
+    return len(AmzSear(html=content, region=region))
+
+
+def parse_rating(content, region):
+    """AmzRating for each search result element - counts ratings."""
+    root = html_module.fromstring(content)
+    return sum(1 for elem in SEARCH_RESULT_XPATH(root) if AmzRating(elem))
+
+
+def parse_product(content, region):
+    """AmzProductDetails from a product page - counts valid pages."""
+    return int(AmzProductDetails(html_module.fromstring(content)).is_valid())
+
+
+def parse_reviews(content, region):
+    """AmzReviews from a reviews page - counts reviews."""
+    return len(AmzReviews(html_module.fromstring(content)))
+
+
+def parse_qa(content, region):
+    """AmzQuestions from a Q&A page - counts questions."""
+    return len(AmzQuestions(html_module.fromstring(content)))
+
+
+# parser name -> (fixture page, parse function)
+PARSERS = {
+    'search': ('search', parse_search),
+    'rating': ('search', parse_rating),
+    'product': ('product', parse_product),
+    'reviews': ('reviews', parse_reviews),
+    'qa': ('qa', parse_qa),
+}
+
+
+def get_regions():
+    return sorted(x for x in os.listdir(FIXTURES_DIR) if os.path.isdir(os.path.join(FIXTURES_DIR, x)))
+
+
+def load_fixture(region, page):
+    with open(os.path.join(FIXTURES_DIR, region, page + '.html'), 'rb') as f:
+        return f.read()
+
+
+def max_rss():
+    """Peak RSS of this process in bytes, or None if unavailable."""
+    if resource is None:
+        return None
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return rss if sys.platform == 'darwin' else rss * 1024
+
+
+def bench(parser, region, seconds):
+    """Run one parser on one region's fixture, returning a result dict."""
+    page, parse = PARSERS[parser]
+    content = load_fixture(region, page)
+    rss_before = max_rss()
+    parse(content, region.upper())  # warm up
+
+    tracemalloc.start()
+    items = parse(content, region.upper())
+    peak_heap = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+
+    pages = 0
+    start = time.perf_counter()
+    while True:
+        parse(content, region.upper())
+        pages += 1
+        elapsed = time.perf_counter() - start
+        if elapsed >= seconds:
+            break
+
+    rss_after = max_rss()
+    return {
+        'parser': parser,
+        'region': region,
+        'pages_per_sec': pages / elapsed,
+        'items_per_sec': pages * items / elapsed,
+        'peak_heap': peak_heap,
+        'peak_rss_growth': None if rss_before is None else rss_after - rss_before,
+    }
+
+
+def main(*passed_args):
+    parser = argparse.ArgumentParser(description='Benchmark the amzSear parsers on synthetic pages modeled on live markup')
+    parser.add_argument('--parsers', type=str, default=','.join(PARSERS),
+        help='Comma separated parsers to run (default: all)')
+    parser.add_argument('--regions', type=str, default=','.join(get_regions()),
+        help='Comma separated fixture regions to run (default: all)')
+    parser.add_argument('--seconds', type=float, default=1.0,
+        help='Minimum time to run each benchmark for')
+    args = parser.parse_args(*passed_args)
+
+    jobs = [(p, r, args.seconds) for p in args.parsers.split(',') for r in args.regions.split(',')]
+
+    print(f'{"parser":8} {"region":6} {"pages/sec":>10} {"items/sec":>11} {"peak heap":>10} {"peak rss":>10}')
+    # A fresh process per benchmark keeps the peak RSS of one from hiding another
+    ctx = multiprocessing.get_context('spawn')
+    for job in jobs:
+        with ctx.Pool(1) as pool:
+            res = pool.apply(bench, job)
+        rss = '-' if res['peak_rss_growth'] is None else f'{res["peak_rss_growth"] / 2**20:.1f} MiB'
+        print(f'{res["parser"]:8} {res["region"]:6} {res["pages_per_sec"]:10.1f} {res["items_per_sec"]:11.1f} '
+              f'{res["peak_heap"] / 2**10:6.0f} KiB {rss:>10}')
+
+
+if __name__ == '__main__':
+    main()
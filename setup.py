@@ -34,4 +34,9 @@ setup(
         "lxml_html_clean>=0.1.0",
         "requests>=2.20.0",
     ],
+    extras_require={
+        'async': ["aiohttp>=3.8.0"],
+        'fast': ["orjson>=3.6.0"],
+        'parquet': ["pyarrow>=10.0.0"],
+    },
 )
@@ -0,0 +1,14 @@
+import os
+
+import pytest
+
+FIXTURES = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'benchmarks', 'fixtures')
+
+
+@pytest.fixture
+def fixture_page():
+    """Read a benchmark fixture page, e.g. fixture_page('us', 'search')."""
+    def read(region, name):
+        with open(os.path.join(FIXTURES, region, name + '.html'), 'rb') as f:
+            return f.read()
+    return read
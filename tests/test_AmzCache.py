@@ -0,0 +1,33 @@
+from amzsear.core.AmzCache import AmzCache
+
+SEARCH_URL = 'https://www.amazon.com/s?k=harry+potter&page=1'
+ROBOT_CHECK = (b'<html><body><form method="get" action="/errors/validateCaptcha">'
+    b'<input id="captchacharacters" name="field-keywords"></form></body></html>')
+
+
+def test_caches_search_page(fixture_page):
+    cache = AmzCache(':memory:')
+    content = fixture_page('us', 'search')
+    assert cache.get(SEARCH_URL) is None
+    cache.set(SEARCH_URL, content)
+    # Equivalent URLs share a cache key
+    assert cache.get('https://WWW.amazon.com/s?page=1&k=harry+potter') == content
+    assert (cache.hits, cache.misses, cache.skipped) == (1, 1, 0)
+
+
+def test_skips_robot_check_and_empty_pages():
+    cache = AmzCache(':memory:')
+    cache.set(SEARCH_URL, ROBOT_CHECK)
+    cache.set('https://www.amazon.com/dp/B000000000', ROBOT_CHECK)
+    cache.set(SEARCH_URL, b'<html><body>No results</body></html>')
+    cache.set('https://www.amazon.com/dp/B000000001', b'')
+    assert len(cache) == 0
+    assert cache.skipped == 4
+    assert cache.get(SEARCH_URL) is None
+
+
+def test_caches_product_page(fixture_page):
+    cache = AmzCache(':memory:')
+    url = 'https://www.amazon.com/dp/B000000000'
+    cache.set(url, fixture_page('us', 'product'))
+    assert cache.get(url) == fixture_page('us', 'product')
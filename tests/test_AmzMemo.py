@@ -0,0 +1,37 @@
+from amzsear.core.AmzMemo import AmzMemo
+from amzsear.core.AmzSear import AmzSear
+
+
+def parse(memo, content, lazy=False):
+    return memo.parse(content, AmzSear._parse_page_products, 'US', None, lazy, raw=True)
+
+
+def test_memo_hit_returns_equal_copy(fixture_page):
+    memo = AmzMemo()
+    content = fixture_page('us', 'search')
+    first = parse(memo, content)
+    second = parse(memo, content)
+    assert (memo.hits, memo.misses) == (1, 1)
+    assert [p.to_dict() for p in first] == [p.to_dict() for p in second]
+
+    second[0].prices['Other'] = '$1.00'
+    assert 'Other' not in parse(memo, content)[0].prices
+
+
+def test_memo_save_and_load(fixture_page, tmp_path):
+    path = str(tmp_path / 'memo.pickle')
+    content = fixture_page('us', 'search')
+    memo = AmzMemo(path=path)
+    expected = [p.to_dict() for p in parse(memo, content)]
+    memo.save()
+
+    loaded = AmzMemo(path=path)
+    assert [p.to_dict() for p in parse(loaded, content)] == expected
+    assert (loaded.hits, loaded.misses) == (1, 0)
+
+
+def test_lazy_results_not_memoized(fixture_page):
+    memo = AmzMemo()
+    products = parse(memo, fixture_page('us', 'search'), lazy=True)
+    assert len(memo) == 0
+    assert products[0].prices is not None
@@ -0,0 +1,32 @@
+from amzsear.core.AmzSear import AmzSear
+from amzsear.core.AmzMultiSear import AmzMultiSear
+
+
+def search(fixture_page, region, cls=AmzSear):
+    amz = cls()
+    amz._add_products(AmzSear._parse_page_products(fixture_page(region.lower(), 'search'), region))
+    return amz
+
+
+def test_merge_single_region_searches(fixture_page):
+    us, uk = search(fixture_page, 'US'), search(fixture_page, 'UK')
+    merged = AmzMultiSear.merge([us, uk])
+    assert len(merged) == len(us) + len(uk)
+    assert merged.regions == ['US', 'UK']
+
+    asin = next(iter(us._index_map))
+    regions = merged.get_regions(asin)
+    assert 'US' in regions and regions['US'] is us[asin]
+
+
+def test_ior_merges_regions_and_errors(fixture_page):
+    multi = search(fixture_page, 'US', AmzMultiSear)
+    multi.regions = ['US']
+    other = search(fixture_page, 'DE', AmzMultiSear)
+    other.regions = ['DE', 'JP']
+    other.errors = {'JP': 'Failed to fetch'}
+
+    multi |= other
+    assert multi.regions == ['US', 'DE', 'JP']
+    assert multi.errors == {'JP': 'Failed to fetch'}
+    assert ('DE', next(iter(other._index_map))[1]) in multi._index_map
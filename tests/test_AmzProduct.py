@@ -0,0 +1,31 @@
+import pytest
+from lxml import html
+
+from amzsear.core.AmzProduct import AmzProduct
+from amzsear.core.AmzSear import AmzSear
+from amzsear.core.selectors import SEARCH_RESULT_XPATH, RESULT_TITLE_XPATH, RESULT_IMAGE_XPATH
+
+MODES = [{}, {'lazy': True}, {'fields': ('title',)}, {'fields': ('prices',), 'lazy': True}]
+
+
+def first_result(fixture_page):
+    root = html.fromstring(fixture_page('us', 'search'))
+    return [x for x in SEARCH_RESULT_XPATH(root) if RESULT_TITLE_XPATH(x)][0]
+
+
+@pytest.mark.parametrize('region', ['us', 'uk', 'de', 'jp'])
+def test_lazy_matches_eager(fixture_page, region):
+    content = fixture_page(region, 'search')
+    eager = AmzSear._parse_page_products(content, region.upper(), None, False)
+    lazy = AmzSear._parse_page_products(content, region.upper(), None, True)
+    assert [p.is_valid() for p in lazy] == [p.is_valid() for p in eager]
+    assert [p.to_dict() for p in lazy] == [p.to_dict() for p in eager]
+
+
+@pytest.mark.parametrize('kwargs', MODES)
+def test_result_without_image_is_invalid(fixture_page, kwargs):
+    result = first_result(fixture_page)
+    assert AmzProduct(result, **kwargs).is_valid()
+    for img in RESULT_IMAGE_XPATH(result):
+        img.drop_tree()
+    assert not AmzProduct(result, **kwargs).is_valid()
@@ -0,0 +1,25 @@
+from amzsear.core.AmzSear import AmzSear
+
+
+def search(fixture_page, region='us'):
+    return AmzSear(html=fixture_page(region, 'search'), region=region.upper())
+
+
+def test_to_columns_matches_to_dict(fixture_page):
+    amz = search(fixture_page)
+    columns = amz.to_columns()
+    for i, product in enumerate(amz.values()):
+        assert {k: v[i] for k, v in columns.items() if v[i] is not None} == product.to_dict()
+
+
+def test_flattened_prices_keep_their_place(fixture_page):
+    amz = search(fixture_page)
+    columns = list(amz.to_columns(flatten=True))
+    prices = [c for c in columns if c.startswith('prices.')]
+    assert prices == sorted(prices)
+    start = columns.index(prices[0])
+    assert columns[start:start + len(prices)] == prices
+    assert columns[:start] == ['title', 'product_url', 'image_url', 'ratings_text', 'ratings_count_text']
+
+    reversed_amz = AmzSear(products=list(amz.values())[::-1])
+    assert list(reversed_amz.to_columns(flatten=True)) == columns
@@ -0,0 +1,42 @@
+from amzsear.core import parse_content
+from amzsear.core.AmzSear import AmzSear
+from amzsear.core.AmzStore import AmzStore
+from amzsear.core.AmzProductDetails import AmzProductDetails
+
+
+def search(fixture_page, fields=None, lazy=False):
+    return AmzSear._parse_page_products(fixture_page('us', 'search'), 'US', fields, lazy)
+
+
+def test_upsert_clears_missing_price(fixture_page):
+    store = AmzStore(':memory:')
+    store.upsert(search(fixture_page), observed_at=1)
+    product = search(fixture_page)[0]
+    stored = store.get(product._index)
+    assert stored['price'] is not None and stored['rating'] is not None
+
+    product.prices = {}
+    product.rating = None
+    store.upsert(product, observed_at=2)
+    stored = store.get(product._index)
+    assert stored['price'] is None and stored['rating'] is None
+    assert stored['first_seen'] == 1 and stored['last_seen'] == 2
+    assert product._index not in [row['asin'] for row in store.find(max_price=1e9)]
+
+
+def test_upsert_keeps_unextracted_fields(fixture_page):
+    store = AmzStore(':memory:')
+    store.upsert(search(fixture_page), observed_at=1)
+    product = search(fixture_page, fields=('title',))[0]
+    price = store.get(product._index)['price']
+
+    store.upsert(product, observed_at=2)
+    assert store.get(product._index)['price'] == price
+
+
+def test_star_distribution_keys(fixture_page):
+    store = AmzStore(':memory:')
+    product = search(fixture_page)[0]
+    product.details = parse_content(fixture_page('us', 'product'), AmzProductDetails)
+    store.upsert(product)
+    assert store.get(product._index)['details']['star_distribution'] == product.details.star_distribution